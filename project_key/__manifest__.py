@@ -9,7 +9,12 @@
     "license": "LGPL-3",
     "author": "Modoolar, Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/project",
-    "depends": ["portal", "project"],
+    "depends": [
+        "portal",
+        "project",
+        "project_sequence_reserve",
+        "project_task_display_name_prefix",
+    ],
     "data": ["views/project_key_views.xml"],
     "post_init_hook": "post_init_hook",
 }
@@ -1,4 +1,5 @@
 # License LGPLv3.0 or later (https://www.gnu.org/licenses/lgpl-3.0.en.html).
 
+from . import ir_config_parameter
 from . import project_project
 from . import project_task
@@ -0,0 +1,44 @@
+# License LGPLv3.0 or later (https://www.gnu.org/licenses/lgpl-3.0.en.html).
+
+from odoo import api, models
+from odoo.exceptions import UserError
+
+from .project_project import TASK_KEY_BACKEND_PARAM
+
+
+class IrConfigParameter(models.Model):
+    _inherit = "ir.config_parameter"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            self._check_task_key_backend(vals.get("key"), vals.get("value"))
+        return super().create(vals_list)
+
+    def write(self, vals):
+        for param in self:
+            self._check_task_key_backend(
+                vals.get("key", param.key), vals.get("value", param.value)
+            )
+        return super().write(vals)
+
+    @api.model
+    def _check_task_key_backend(self, key, value):
+        """Refuse switching to the counter backend while projects still
+        allocate their keys from sequences: their counters would restart at 1.
+        """
+        if key != TASK_KEY_BACKEND_PARAM or value != "counter":
+            return
+        if (
+            self.env["project.project"]
+            .sudo()
+            .with_context(active_test=False)
+            .search_count([("task_key_sequence_id", "!=", False)], limit=1)
+        ):
+            raise UserError(
+                self.env._(
+                    "Task key sequences still exist, run "
+                    "_migrate_task_key_sequences_to_counters() on project.project "
+                    "to switch to the counter backend."
+                )
+            )
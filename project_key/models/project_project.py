@@ -1,8 +1,14 @@
 # Copyright 2017 - 2018 Modoolar <info@modoolar.com>
 # License LGPLv3.0 or later (https://www.gnu.org/licenses/lgpl-3.0.en.html).
 
+import logging
+
 from odoo import api, fields, models
-from odoo.tools import config
+from odoo.tools import SQL, config, escape_psql, split_every
+
+_logger = logging.getLogger(__name__)
+
+TASK_KEY_BACKEND_PARAM = "project_key.task_key_backend"
 
 
 class Project(models.Model):
@@ -21,6 +27,19 @@ class Project(models.Model):
         ("project_key_unique", "UNIQUE(key)", "Project key must be unique")
     ]
 
+    def init(self):
+        # Per project task key counters, used instead of one ir.sequence per
+        # project when the "counter" task key backend is selected.
+        self.env.cr.execute(
+            """
+            CREATE TABLE IF NOT EXISTS project_task_key_counter (
+              project_id integer PRIMARY KEY
+                REFERENCES project_project(id) ON DELETE CASCADE,
+              number_next integer NOT NULL DEFAULT 1
+            )
+            """
+        )
+
     @api.onchange("name")
     def _onchange_project_name(self):
         for rec in self:
@@ -42,12 +61,17 @@ class Project(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
+        keyless_vals_list = [vals for vals in vals_list if not vals.get("key")]
+        if keyless_vals_list:
+            keys = self.generate_project_keys(
+                [vals["name"] for vals in keyless_vals_list],
+                reserved={vals["key"] for vals in vals_list if vals.get("key")},
+            )
+            for vals, key in zip(keyless_vals_list, keys, strict=True):
+                vals["key"] = key
+
         new_projects = self.env["project.project"]
         for vals in vals_list:
-            key = vals.get("key", False)
-            if not key:
-                vals["key"] = self.generate_project_key(vals["name"])
-
             # Tasks must be created after the project.
             task_vals = vals.pop("task_ids", [])
 
@@ -65,7 +89,8 @@ class Project(models.Model):
                     project_sequence_company=company_id
                 )
 
-            new_project.create_sequence()
+            if not new_project._use_task_key_counter():
+                new_project.create_sequence()
 
             # Tasks must be created after the project.
             if task_vals:
@@ -144,83 +169,300 @@ class Project(models.Model):
 
         return values
 
-    def get_next_task_key(self):
+    def _is_project_key_disabled(self):
         test_project_key = self.env.context.get("test_project_key")
-        if (config["test_enable"] and not test_project_key) or (
+        return (config["test_enable"] and not test_project_key) or (
             config["demo"].get("project_key") and not test_project_key
-        ):
+        )
+
+    @api.model
+    def _use_task_key_counter(self):
+        """
+        Task keys are allocated either from one ir.sequence per project
+        ("sequence", default) or from the project_task_key_counter table
+        ("counter"), depending on the project_key.task_key_backend parameter.
+        """
+        backend = (
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(TASK_KEY_BACKEND_PARAM, "sequence")
+        )
+        return backend == "counter"
+
+    def get_next_task_key(self):
+        if self._is_project_key_disabled():
             return False
+        if self._use_task_key_counter():
+            return self.get_next_task_keys(1)[0]
         return self.sudo().task_key_sequence_id.next_by_id()
 
+    def _get_next_task_key_counters(self, count):
+        # The upsert locks the counter row, so concurrent workers are
+        # serialized per project and always get distinct blocks.
+        self.env.cr.execute(
+            """
+            INSERT INTO project_task_key_counter (project_id, number_next)
+            VALUES (%s, %s + 1)
+            ON CONFLICT (project_id) DO UPDATE
+            SET number_next = project_task_key_counter.number_next + %s
+            RETURNING number_next - %s
+            """,
+            (self.id, count, count, count),
+        )
+        start = self.env.cr.fetchone()[0]
+        return [f"{self.key}-{number}" for number in range(start, start + count)]
+
+    def get_next_task_keys(self, count):
+        """
+        This method reserves a block of task keys for the current project
+        :param count: Number of keys to reserve
+        :return: Returns the list of reserved keys, in sequence order
+        """
+        self.ensure_one()
+        if not count or self._is_project_key_disabled():
+            return [False] * count
+
+        if self._use_task_key_counter():
+            return self._get_next_task_key_counters(count)
+
+        sequence = self.sudo().task_key_sequence_id
+        if not sequence:
+            return [False] * count
+
+        return sequence._next_block(count)
+
     def generate_project_key(self, text):
-        test_project_key = self.env.context.get("test_project_key")
-        if (config["test_enable"] and not test_project_key) or (
-            config["demo"].get("project_key") and not test_project_key
-        ):
-            return False
+        return self.generate_project_keys([text])[0]
 
+    def generate_project_keys(self, texts, reserved=None):
+        """
+        This method generates unique project keys for a batch of names
+        :param texts: Project names to generate the keys from
+        :param reserved: Keys which must not be generated (i.e. explicit keys
+        of projects created in the same batch)
+        :return: Returns the list of keys, in the same order as texts
+        """
+        if self._is_project_key_disabled():
+            return [False] * len(texts)
+        return self._generate_project_unique_keys(
+            [self._get_project_key_acronym(text) for text in texts],
+            reserved=reserved,
+        )
+
+    def _get_project_key_acronym(self, text):
         if not text:
             return ""
 
         data = text.split(" ")
         if len(data) == 1:
-            return self._generate_project_unique_key(data[0][:3].upper())
+            return data[0][:3].upper()
 
-        key = []
-        for item in data:
-            key.append(item[:1].upper())
-        return self._generate_project_unique_key("".join(key))
+        return "".join(item[:1].upper() for item in data)
 
     def _generate_project_unique_key(self, text):
+        return self._generate_project_unique_keys([text])[0]
+
+    def _generate_project_unique_keys(self, texts, reserved=None):
+        """
+        This method returns the lowest free key for every text. Existing keys
+        are fetched once per prefix, collisions inside the batch are resolved
+        in memory.
+        """
         self_context = self.with_context(active_test=False)
-        res = text
-        unique_key = False
-        counter = 0
-        while not unique_key:
-            if counter != 0:
-                res = f"{text}{counter}"
-            unique_key = not bool(self_context.search([("key", "=", res)]))
-            counter += 1
+        taken = set(reserved or ())
+        fetched_prefixes = set()
+        res = []
+        for text in texts:
+            if not text:
+                res.append("")
+                continue
+
+            if text not in fetched_prefixes:
+                projects = self_context.search_fetch(
+                    [("key", "=like", escape_psql(text) + "%")], ["key"]
+                )
+                taken.update(projects.mapped("key"))
+                fetched_prefixes.add(text)
+
+            key = text
+            counter = 1
+            while key in taken:
+                key = f"{text}{counter}"
+                counter += 1
+
+            taken.add(key)
+            res.append(key)
 
         return res
 
     def _update_task_keys(self):
         """
         This method will update task keys of the current project.
+        When the full keys are stored, every task row of the project is
+        rewritten. Derived keys (see project_key_derived) follow the project
+        key without any update.
         """
         self.ensure_one()
+        if not self.env["project.task"]._fields["key"].store:
+            return
         self.flush_model()
+        self.env["project.task"].flush_model(["key", "key_number", "project_id"])
+        # Keys are rebuilt from the stored numeric part, served by the
+        # (project_id, key_number) index, instead of parsing every key.
         reindex_query = """
         UPDATE project_task
-        SET key = x.key
-        FROM (
-          SELECT t.id, p.key || '-' || split_part(t.key, '-', 2) AS key
-          FROM project_task t
-          INNER JOIN project_project p ON t.project_id = p.id
-          WHERE t.project_id = %s
-        ) AS x
-        WHERE project_task.id = x.id;
+        SET key = %s || '-' || key_number
+        WHERE project_id = %s AND key_number IS NOT NULL
         """
 
-        self.env.cr.execute(reindex_query, (self.id,))
-        self.task_ids.invalidate_model(["key"])
+        self.env.cr.execute(reindex_query, (self.key, self.id))
+        self.env["project.task"].invalidate_model(["key"])
 
     @api.model
-    def _set_default_project_key(self):
+    def _set_default_project_key(self, chunk_size=1000):
         """
         This method will be called from the post_init hook in order to set
         default values on project.project and
         project.task, so we leave those tables nice and clean after module
         installation.
+        Projects are processed in chunks, task keys are assigned in SQL.
         :return:
         """
-        for project in self.search([("key", "=", False)]):
-            project.key = self.generate_project_key(project.name)
-            project.create_sequence()
-
-            for task in project.task_ids:
-                task.key = project.get_next_task_key()
+        projects = self.search([("key", "=", False)])
+        total = len(projects)
+        done = 0
+        for project_ids in split_every(chunk_size, projects.ids):
+            self.browse(project_ids)._backfill_project_keys()
+            done += len(project_ids)
+            _logger.info("Project keys set on %s/%s projects", done, total)
+            self.env.invalidate_all()
+
+    def _backfill_project_keys(self):
+        """
+        This method sets the keys of the current projects and numbers their
+        tasks with a window function, then creates the key sequences (or
+        counters) starting right after the last task key of each project.
+        """
+        self.flush_model()
+        self.env["project.task"].flush_model(["key", "project_id"])
+        keys = self.generate_project_keys(self.mapped("name"))
+        # Written in SQL so that write() does not re-key the tasks per project.
+        self.env.cr.execute(
+            """
+            UPDATE project_project p
+            SET key = v.key
+            FROM unnest(%s::int[], %s::varchar[]) AS v(id, key)
+            WHERE p.id = v.id
+            """,
+            (self.ids, [key or None for key in keys]),
+        )
+        self.invalidate_recordset(["key"])
+
+        # Derived keys (see project_key_derived) only store the numeric part
+        set_key = (
+            SQL("key = x.key || '-' || x.key_number,")
+            if self.env["project.task"]._fields["key"].store
+            else SQL()
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE project_task
+                SET %s key_number = x.key_number
+                FROM (
+                  SELECT t.id, p.key, row_number() OVER (
+                    PARTITION BY t.project_id ORDER BY t.id
+                  ) AS key_number
+                  FROM project_task t
+                  INNER JOIN project_project p ON t.project_id = p.id
+                  WHERE t.project_id IN %s
+                ) AS x
+                WHERE project_task.id = x.id
+                """,
+                set_key,
+                tuple(self.ids),
+            )
+        )
+        self.env["project.task"].invalidate_model(["key", "key_number"])
+
+        if self._use_task_key_counter():
+            self.env.cr.execute(
+                """
+                INSERT INTO project_task_key_counter (project_id, number_next)
+                SELECT p.id, count(t.id) + 1
+                FROM project_project p
+                LEFT JOIN project_task t ON t.project_id = p.id
+                WHERE p.id IN %s
+                GROUP BY p.id
+                ON CONFLICT (project_id) DO UPDATE
+                SET number_next = EXCLUDED.number_next
+                """,
+                (tuple(self.ids),),
+            )
+            return
+
+        self.env.cr.execute(
+            """
+            SELECT project_id, count(*)
+            FROM project_task
+            WHERE project_id IN %s
+            GROUP BY project_id
+            """,
+            (tuple(self.ids),),
+        )
+        task_counts = dict(self.env.cr.fetchall())
+        for project in self:
+            sequence_data = project._prepare_sequence_data()
+            number_next = task_counts.get(project.id, 0) + 1
+            sequence_data.update(
+                number_next=number_next, number_next_actual=number_next
+            )
+            sequence = self.env["ir.sequence"].sudo().create(sequence_data)
+            project.write({"task_key_sequence_id": sequence.id})
 
     @api.depends("key")
     def _compute_show_key_warning(self):
         self.show_key_warning = self.key and "-" in self.key
+
+    @api.model
+    def _migrate_task_key_sequences_to_counters(self):
+        """
+        This method switches the database to the "counter" task key backend:
+        the next value of every project key sequence is copied to the counter
+        table, then the sequences are removed.
+        """
+        projects = self.with_context(active_test=False).search(
+            [("task_key_sequence_id", "!=", False)]
+        )
+        if projects:
+            projects._move_task_key_sequences_to_counters()
+        self.env["ir.config_parameter"].sudo().set_param(
+            TASK_KEY_BACKEND_PARAM, "counter"
+        )
+
+    def _move_task_key_sequences_to_counters(self):
+        sequences = self.sudo().task_key_sequence_id
+        # number_next_actual reads each PostgreSQL sequence, honouring
+        # is_called, so it is right after a restart by a "Next Number" edit.
+        next_numbers = {
+            sequence.id: sequence.number_next_actual for sequence in sequences
+        }
+        self.env.cr.execute(
+            """
+            INSERT INTO project_task_key_counter (project_id, number_next)
+            SELECT v.project_id, v.number_next
+            FROM unnest(%s::int[], %s::int[]) AS v(project_id, number_next)
+            ON CONFLICT (project_id) DO UPDATE
+            SET number_next = EXCLUDED.number_next
+            """,
+            (
+                self.ids,
+                [
+                    next_numbers[project.sudo().task_key_sequence_id.id]
+                    for project in self
+                ],
+            ),
+        )
+        self.write({"task_key_sequence_id": False})
+        sequences.unlink()
+        _logger.info("Task keys of %s projects migrated to counters", len(self))
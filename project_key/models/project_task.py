@@ -1,9 +1,18 @@
 # Copyright 2017 - 2018 Modoolar <info@modoolar.com>
 # License LGPLv3.0 or later (https://www.gnu.org/licenses/lgpl-3.0.en.html).
 
+import re
+from collections import defaultdict
+
 from odoo import api, fields, models
+from odoo.osv import expression
+from odoo.tools import SQL, escape_psql
+from odoo.tools.sql import column_exists, create_index
 
 TASK_URL = "/odoo/%s/%s"
+KEY_NUMBER_RE = re.compile(r"-(\d+)$")
+TASK_KEY_RE = re.compile(r"^\S+-\d+$")
+TASK_KEY_PREFIX_RE = re.compile(r"^\S+-\d*$")
 
 
 class Task(models.Model):
@@ -12,10 +21,99 @@ class Task(models.Model):
 
     key = fields.Char(size=20, index=True)
 
+    # Numeric part of the key, used to rebuild the keys on project key change
+    # and to order the key completions.
+    key_number = fields.Integer(copy=False, readonly=True)
+
     url = fields.Char(string="URL", compute="_compute_task_url")
 
     _sql_constraints = [("task_key_unique", "UNIQUE(key)", "Task key must be unique!")]
 
+    def _auto_init(self):
+        # Fill key_number from the existing keys in one statement when the
+        # column is created. The key column itself may be created by this
+        # same call on install, so the fill runs afterwards.
+        cr = self.env.cr
+        fill_key_number = not column_exists(cr, "project_task", "key_number")
+        res = super()._auto_init()
+        if fill_key_number:
+            cr.execute(
+                """
+                UPDATE project_task
+                SET key_number = substring(key from '-([0-9]+)$')::int4
+                WHERE key ~ '-[0-9]+$'
+                """
+            )
+        create_index(
+            cr,
+            "project_task_project_id_key_number_index",
+            "project_task",
+            ["project_id", "key_number"],
+        )
+        # Serves left-anchored LIKE on keys whatever the database collation.
+        if self._fields["key"].store:
+            create_index(
+                cr,
+                "project_task_key_pattern_index",
+                "project_task",
+                ["key text_pattern_ops"],
+            )
+        return res
+
+    @api.model
+    def _get_key_number(self, key):
+        match = key and KEY_NUMBER_RE.search(key)
+        return int(match.group(1)) if match else False
+
+    @api.model
+    def _search_display_name(self, operator, value):
+        if (
+            operator in ("ilike", "=ilike", "=", "like", "=like")
+            and isinstance(value, str)
+            and TASK_KEY_RE.match(value.strip())
+        ):
+            # Exact keys, as typed or upper cased, are served by the key index
+            key = value.strip()
+            return [("key", "in", list({key, key.upper()}))]
+        return super()._search_display_name(operator, value)
+
+    @api.model
+    def _get_key_prefix_domain(self, prefix):
+        """
+        This method returns the domain of the tasks whose key starts with the
+        given prefix, as typed or upper cased, served by the key pattern index.
+        """
+        return expression.OR(
+            [
+                [("key", "=like", escape_psql(key_prefix) + "%")]
+                for key_prefix in {prefix, prefix.upper()}
+            ]
+        )
+
+    @api.model
+    def name_search(self, name="", args=None, operator="ilike", limit=100):
+        """Complete partially typed keys first, ordered by their numeric
+        part, then the other matches of the name search."""
+        prefix = name.strip()
+        like_operators = ("ilike", "=ilike", "like", "=like")
+        if operator not in like_operators or not TASK_KEY_PREFIX_RE.match(prefix):
+            return super().name_search(name, args, operator, limit)
+        domain = expression.AND([args or [], self._get_key_prefix_domain(prefix)])
+        records = self.search_fetch(
+            domain, ["display_name"], limit=limit, order="key_number, id"
+        )
+        res = [(rec.id, rec.display_name) for rec in records.sudo()]
+        if limit and len(res) >= limit:
+            return res
+        # Words typed with a trailing dash also match task names
+        found_ids = set(records.ids)
+        res += [
+            item
+            for item in super().name_search(name, args, operator, limit)
+            if item[0] not in found_ids
+        ]
+        return res[:limit] if limit else res
+
     def _compute_task_url(self):
         for task in self:
             task.url = TASK_URL % (task._name, task.id)
@@ -23,6 +121,7 @@ class Task(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         ctx = self.env.context.get
+        vals_by_project = defaultdict(list)
         for vals in vals_list:
             project_id = vals.get("project_id", False)
             if not project_id:
@@ -32,39 +131,92 @@ class Task(models.Model):
                 project_id = ctx("id", False)
 
             if project_id:
-                project = self.env["project.project"].browse(project_id)
-                vals["key"] = project.get_next_task_key()
+                vals_by_project[project_id].append(vals)
+
+        # Reserve all the keys of a project at once instead of one per task.
+        for project_id, project_vals_list in vals_by_project.items():
+            project = self.env["project.project"].browse(project_id)
+            keys = project.get_next_task_keys(len(project_vals_list))
+            for vals, key in zip(project_vals_list, keys, strict=True):
+                vals["key"] = key
+
+        for vals in vals_list:
+            if "key" in vals:
+                vals["key_number"] = self._get_key_number(vals["key"])
+                if not self._fields["key"].store:
+                    del vals["key"]
         return super().create(vals_list)
 
     def write(self, vals):
+        if "key" in vals:
+            vals = dict(vals, key_number=self._get_key_number(vals["key"]))
+            if not self._fields["key"].store:
+                del vals["key"]
+
         project_id = vals.get("project_id", False)
         if not project_id:
             return super().write(vals)
 
         project = self.env["project.project"].browse(project_id)
-        for task in self:
-            if task.key and task.project_id.id == project.id:
-                continue
-
-            values = self.prepare_task_for_project_switch(task, project)
-            super(Task, task).write(values)
+        tasks = self.filtered(lambda t: not t.key or t.project_id.id != project.id)
+        if tasks:
+            tasks._switch_project_keys(project)
 
         return super().write(vals)
 
-    def prepare_task_for_project_switch(self, task, project):
-        data = {"key": project.get_next_task_key(), "project_id": project.id}
-
-        if len(task.child_ids) > 0:
-            data["child_ids"] = [
-                (1, child.id, self.prepare_task_for_project_switch(child, project))
-                for child in task.child_ids
-            ]
-        return data
-
-    @api.depends("key", "name")
-    def _compute_display_name(self):
-        super()._compute_display_name()
-        for task in self:
-            if task.key:
-                task.display_name = f"[{task.key}] {task.display_name}"
-        return
+    def _switch_project_keys(self, project):
+        """
+        This method moves the current tasks and all their descendants to the
+        given project, reserving the new keys in one block.
+        """
+        self.flush_model(["key", "parent_id", "project_id"])
+        self.env.cr.execute(
+            """
+            WITH RECURSIVE subtree AS (
+              SELECT id, 0 AS depth
+              FROM project_task
+              WHERE id IN %s
+              UNION ALL
+              SELECT t.id, s.depth + 1
+              FROM project_task t
+              INNER JOIN subtree s ON t.parent_id = s.id
+            )
+            SELECT id FROM subtree ORDER BY depth, id
+            """,
+            (tuple(self.ids),),
+        )
+        # A task may be reached twice when it is also a descendant of another
+        # switched task.
+        task_ids = list(dict.fromkeys(row[0] for row in self.env.cr.fetchall()))
+        keys = project.get_next_task_keys(len(task_ids))
+        # Derived keys (see project_key_derived) only store the numeric part
+        set_key = SQL("key = v.key,") if self._fields["key"].store else SQL()
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE project_task t
+                SET %s key_number = v.key_number
+                FROM unnest(%s::int[], %s::varchar[], %s::int[])
+                    AS v(id, key, key_number)
+                WHERE t.id = v.id
+                """,
+                set_key,
+                task_ids,
+                [key or None for key in keys],
+                [self._get_key_number(key) or None for key in keys],
+            )
+        )
+        subtree = self.browse(task_ids)
+        subtree.invalidate_recordset(["key", "key_number"])
+
+        descendants = subtree - self
+        if descendants:
+            super(Task, descendants).write({"project_id": project.id})
+
+    def _display_name_prefix_providers(self):
+        return super()._display_name_prefix_providers() + [
+            (["key"], "_get_key_display_name_prefixes")
+        ]
+
+    def _get_key_display_name_prefixes(self):
+        return {task.id: task.key for task in self}
@@ -17,6 +17,7 @@ class TestProject(TestCommon):
 
         self.assertEqual(self.task11.key, "XXX-1")
         self.assertEqual(self.task12.key, "XXX-2")
+        self.assertEqual(self.task12.key_number, 2)
 
     def test_03_name_search(self):
         projects = self.Project.name_search("ODO")
@@ -80,3 +81,36 @@ class TestProject(TestCommon):
 
         project.key = "TEST-1"
         self.assertTrue(project.show_key_warning)
+
+    def test_13_generate_unique_keys_batch(self):
+        self.Project.create({"name": "OCA Ops", "key": "OCA2"})
+        projects = self.Project.create(
+            [
+                {"name": "OCA"},
+                {"name": "OCA"},
+                {"name": "Other", "key": "OCA3"},
+                {"name": "OCA"},
+            ]
+        )
+        self.assertEqual(projects.mapped("key"), ["OCA1", "OCA4", "OCA3", "OCA5"])
+
+    def test_14_set_default_project_key(self):
+        project = self.Project.create({"name": "Legacy Project"})
+        tasks = self.Task.create(
+            [
+                {"name": "a", "project_id": project.id},
+                {"name": "b", "project_id": project.id},
+            ]
+        )
+        self.env.cr.execute(
+            "UPDATE project_project SET key = NULL WHERE id = %s", (project.id,)
+        )
+        self.env.cr.execute(
+            "UPDATE project_task SET key = NULL WHERE id IN %s", (tuple(tasks.ids),)
+        )
+        self.env.invalidate_all()
+
+        self.Project._set_default_project_key(chunk_size=2)
+        self.assertEqual(project.key, "LP")
+        self.assertEqual(tasks.mapped("key"), ["LP-1", "LP-2"])
+        self.assertEqual(project.get_next_task_key(), "LP-3")
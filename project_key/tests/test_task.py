@@ -1,6 +1,8 @@
 # Copyright 2017 - 2018 Modoolar <info@modoolar.com>
 # License LGPLv3.0 or later (https://www.gnu.org/licenses/lgpl-3.0.en.html).
 
+from odoo.exceptions import UserError
+
 from .test_common import TestCommon
 
 
@@ -52,3 +54,100 @@ class TestTask(TestCommon):
 
     def test_08_create_new_company(self):
         self.env["res.company"].create({"name": "New company"})
+
+    def test_09_create_batch(self):
+        tasks = self.Task.create(
+            [
+                {"name": "batch 1", "project_id": self.project_1.id},
+                {"name": "batch 2", "project_id": self.project_2.id},
+                {"name": "batch 3", "project_id": self.project_1.id},
+                {"name": "batch 4"},
+            ]
+        )
+        self.assertEqual(tasks.mapped("key"), ["OCA-3", "ODOO-2", "OCA-4", False])
+
+    def test_10_get_next_task_keys_no_gap(self):
+        self.project_1.task_key_sequence_id.write(
+            {"implementation": "no_gap", "number_next": 3}
+        )
+        self.assertEqual(
+            self.project_1.get_next_task_keys(3), ["OCA-3", "OCA-4", "OCA-5"]
+        )
+        self.assertEqual(self.project_1.get_next_task_key(), "OCA-6")
+
+    def test_11_switch_project_subtree(self):
+        task13 = self.Task.create(
+            {"name": "4", "parent_id": self.task12.id, "project_id": self.project_1.id}
+        )
+        task14 = self.Task.create(
+            {"name": "5", "parent_id": self.task11.id, "project_id": self.project_1.id}
+        )
+        self.task11.write({"project_id": self.project_2.id})
+        self.assertEqual(self.task11.key, "ODOO-2")
+        self.assertEqual(self.task12.key, "ODOO-3")
+        self.assertEqual(task14.key, "ODOO-4")
+        self.assertEqual(task13.key, "ODOO-5")
+        self.assertEqual(task13.project_id, self.project_2)
+
+    def test_12_key_number(self):
+        self.assertEqual(self.task11.key_number, 1)
+        self.assertEqual(self.task21.key_number, 1)
+        self.assertFalse(self.task30.key_number)
+        self.task11.key = "OCA-42"
+        self.assertEqual(self.task11.key_number, 42)
+
+    def test_13_counter_backend(self):
+        self.Project._migrate_task_key_sequences_to_counters()
+        self.assertFalse(self.project_1.task_key_sequence_id)
+        task = self.Task.create({"name": "counter", "project_id": self.project_1.id})
+        self.assertEqual(task.key, "OCA-3")
+
+        project = self.Project.create({"name": "Counter Project"})
+        self.assertFalse(project.task_key_sequence_id)
+        self.assertEqual(project.get_next_task_keys(2), ["CP-1", "CP-2"])
+        self.assertEqual(project.get_next_task_key(), "CP-3")
+
+    def test_14_name_search_exact_key(self):
+        task13 = self.Task.create({"name": "x", "project_id": self.project_1.id})
+        for _i in range(8):
+            self.Task.create({"name": "y", "project_id": self.project_1.id})
+        tasks = self.Task.search([("display_name", "ilike", "OCA-1")])
+        self.assertEqual(tasks, self.task11)
+        tasks = self.Task.search([("display_name", "ilike", "oca-3")])
+        self.assertEqual(tasks, task13)
+
+        self.project_1.key = "XXX"
+        self.assertFalse(self.Task.search([("display_name", "ilike", "OCA-1")]))
+        tasks = self.Task.search([("display_name", "ilike", "XXX-1")])
+        self.assertEqual(tasks, self.task11)
+
+    def test_15_name_search_key_prefix(self):
+        tasks = self.Task.create(
+            [{"name": str(i), "project_id": self.project_1.id} for i in range(10)]
+        )
+        task_ids = [x[0] for x in self.Task.name_search("oca-1")]
+        self.assertEqual(task_ids, [self.task11.id] + tasks[-3:].ids)
+        task_ids = [x[0] for x in self.Task.name_search("OCA-", limit=3)]
+        self.assertEqual(task_ids, [self.task11.id, self.task12.id, tasks[0].id])
+
+    def test_16_counter_backend_migration_guard(self):
+        with self.assertRaises(UserError):
+            self.env["ir.config_parameter"].sudo().set_param(
+                "project_key.task_key_backend", "counter"
+            )
+        # Editing the next number restarts the PostgreSQL sequence
+        self.project_1.task_key_sequence_id.sudo().number_next_actual = 10
+        self.Project._migrate_task_key_sequences_to_counters()
+        task = self.Task.create({"name": "counter", "project_id": self.project_1.id})
+        self.assertEqual(task.key, "OCA-10")
+
+    def test_17_name_search_key_prefix_and_names(self):
+        project = self.Project.create({"name": "Research", "key": "RE"})
+        keyed_task = self.Task.create({"name": "Survey", "project_id": project.id})
+        named_task = self.Task.create({"name": "re-open the survey"})
+        task_ids = [x[0] for x in self.Task.name_search("re-")]
+        self.assertEqual(task_ids[0], keyed_task.id)
+        self.assertIn(named_task.id, task_ids)
+        self.assertEqual(len(task_ids), len(set(task_ids)))
+        task_ids = [x[0] for x in self.Task.name_search("re-", limit=1)]
+        self.assertEqual(task_ids, [keyed_task.id])
@@ -0,0 +1,14 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+{
+    "name": "Project Key Derived",
+    "summary": "Derive task keys from the project key and the task number",
+    "version": "18.0.1.0.0",
+    "category": "Project",
+    "website": "https://github.com/OCA/project",
+    "author": "Odoo Community Association (OCA)",
+    "license": "LGPL-3",
+    "depends": ["project_key"],
+    "uninstall_hook": "uninstall_hook",
+    "installable": True,
+}
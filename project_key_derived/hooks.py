@@ -0,0 +1,17 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+
+
+def uninstall_hook(env):
+    # The key column is not maintained while the keys are derived: store them
+    # again, clearing them first so that no stale key collides on the way.
+    env.cr.execute("UPDATE project_task SET key = NULL WHERE key_number IS NOT NULL")
+    env.cr.execute(
+        """
+        UPDATE project_task t
+        SET key = p.key || '-' || t.key_number
+        FROM project_project p
+        WHERE p.id = t.project_id
+        AND p.key IS NOT NULL
+        AND t.key_number IS NOT NULL
+        """
+    )
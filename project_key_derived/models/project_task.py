@@ -0,0 +1,216 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+
+import re
+from collections import defaultdict
+
+from odoo import api, fields, models
+from odoo.osv import expression
+from odoo.tools import SQL, escape_psql
+from odoo.tools.sql import create_index
+
+DERIVED_KEY_RE = re.compile(r"^(.+)-(\d*)$")
+LIKE_SQL_OPERATORS = {
+    "like": "LIKE",
+    "ilike": "ILIKE",
+    "=like": "LIKE",
+    "=ilike": "ILIKE",
+}
+
+
+class Task(models.Model):
+    _inherit = "project.task"
+
+    # Only the numeric part is stored: renaming a project key touches the
+    # project row alone.
+    key = fields.Char(
+        compute="_compute_key",
+        search="_search_key",
+        store=False,
+        index=False,
+    )
+
+    _sql_constraints = [
+        (
+            "task_key_number_unique",
+            "UNIQUE(project_id, key_number)",
+            "Task key must be unique!",
+        )
+    ]
+
+    def _auto_init(self):
+        res = super()._auto_init()
+        # Serves the completion of partially typed key numbers
+        create_index(
+            self.env.cr,
+            "project_task_project_id_key_number_text_index",
+            "project_task",
+            ["project_id", "(key_number::text) text_pattern_ops"],
+        )
+        return res
+
+    @api.depends("project_id.key", "key_number")
+    def _compute_key(self):
+        for task in self:
+            project_key = task.project_id.key
+            task.key = (
+                f"{project_key}-{task.key_number}"
+                if project_key and task.key_number
+                else False
+            )
+
+    def _search_key(self, operator, value):
+        if operator in expression.NEGATIVE_TERM_OPERATORS:
+            positive_operator = expression.TERM_OPERATORS_NEGATION[operator]
+            return [
+                "!",
+                *expression.normalize_domain(
+                    self._search_key(positive_operator, value)
+                ),
+            ]
+        if operator == "=":
+            operator, value = "in", [value]
+        if operator == "in":
+            keys = [key for key in value if key]
+            domain = self._get_key_exact_domain(keys, "=")
+            if len(keys) < len(value):
+                domain = expression.OR([domain, self._get_keyless_domain()])
+            return domain
+        if operator in ("=like", "=ilike"):
+            literal, is_prefix = self._parse_key_pattern(value)
+            match = literal is not None and DERIVED_KEY_RE.match(literal)
+            project_operator = "=" if operator == "=like" else "=ilike"
+            if match and not is_prefix and match.group(2):
+                return self._get_key_exact_domain([literal], project_operator)
+            if match and is_prefix:
+                return self._get_key_number_prefix_domain(
+                    match.group(1), match.group(2), project_operator
+                )
+        if operator not in LIKE_SQL_OPERATORS:
+            return expression.FALSE_DOMAIN
+        return self._get_key_pattern_domain(operator, value)
+
+    @api.model
+    def _parse_key_pattern(self, pattern):
+        """
+        This method returns the literal text of a LIKE pattern, and whether
+        it ends with a wildcard, or (None, False) when the pattern holds
+        wildcards anywhere else.
+        """
+        literal = []
+        index = 0
+        while index < len(pattern):
+            char = pattern[index]
+            if char == "\\":
+                index += 1
+                literal.append(pattern[index : index + 1])
+            elif char == "%" and index == len(pattern) - 1:
+                return "".join(literal), True
+            elif char in "%_":
+                return None, False
+            else:
+                literal.append(char)
+            index += 1
+        return "".join(literal), False
+
+    @api.model
+    def _get_projects_query(self, project_key, operator):
+        return (
+            self.env["project.project"]
+            .sudo()
+            .with_context(active_test=False)
+            ._search([("key", operator, project_key)])
+        )
+
+    @api.model
+    def _get_key_exact_domain(self, keys, project_operator):
+        """
+        This method returns the domain of the tasks with the given keys,
+        served by the project key and the (project_id, key_number) indexes.
+        """
+        numbers_by_project_key = defaultdict(set)
+        for key in keys:
+            match = DERIVED_KEY_RE.match(key.strip())
+            if match and match.group(2):
+                project_key = match.group(1)
+                if project_operator == "=ilike":
+                    project_key = escape_psql(project_key)
+                numbers_by_project_key[project_key].add(int(match.group(2)))
+        if not numbers_by_project_key:
+            return expression.FALSE_DOMAIN
+        return expression.OR(
+            [
+                [
+                    (
+                        "project_id",
+                        "in",
+                        self._get_projects_query(project_key, project_operator),
+                    ),
+                    ("key_number", "in", list(numbers)),
+                ]
+                for project_key, numbers in numbers_by_project_key.items()
+            ]
+        )
+
+    @api.model
+    def _get_key_number_prefix_domain(self, project_key, number_prefix, operator):
+        """
+        This method returns the domain of the tasks whose key starts with the
+        given project key and key number prefix, served by the expression
+        index on the key numbers.
+        """
+        if operator == "=ilike":
+            project_key = escape_psql(project_key)
+        domain = [
+            ("project_id", "in", self._get_projects_query(project_key, operator)),
+            ("key_number", "!=", False),
+        ]
+        if not number_prefix:
+            return domain
+        query = self.sudo().with_context(active_test=False)._search(domain)
+        query.add_where(
+            SQL(
+                "%s::text LIKE %s",
+                SQL.identifier(query.table, "key_number"),
+                f"{number_prefix}%",
+            )
+        )
+        return [("id", "in", query)]
+
+    @api.model
+    def _get_key_pattern_domain(self, operator, value):
+        """
+        This method returns the domain of the tasks whose full key matches
+        any other pattern, by rebuilding the keys of the candidate tasks.
+        """
+        if operator in ("like", "ilike"):
+            value = f"%{value}%"
+        query = (
+            self.sudo()
+            .with_context(active_test=False)
+            ._search([("key_number", "!=", False)])
+        )
+        query.add_where(
+            SQL(
+                """
+                EXISTS (
+                  SELECT 1 FROM project_project p
+                  WHERE p.id = %s AND p.key || '-' || %s %s %s
+                )
+                """,
+                SQL.identifier(query.table, "project_id"),
+                SQL.identifier(query.table, "key_number"),
+                SQL(LIKE_SQL_OPERATORS[operator]),
+                value,
+            )
+        )
+        return [("id", "in", query)]
+
+    @api.model
+    def _get_keyless_domain(self):
+        return [
+            "|",
+            "|",
+            ("key_number", "=", False),
+            ("project_id", "=", False),
+            ("project_id", "in", self._get_projects_query(False, "=")),
+        ]
@@ -0,0 +1,53 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+
+from odoo.addons.project_key.tests.test_common import TestCommon
+
+
+class TestProjectTask(TestCommon):
+    def test_derived_key(self):
+        self.assertFalse(self.Task._fields["key"].store)
+        self.assertEqual(self.task11.key, "OCA-1")
+        self.assertEqual(self.task12.key, "OCA-2")
+        self.assertFalse(self.task30.key)
+
+    def test_rename_project_key(self):
+        self.project_1.key = "XXX"
+        self.assertEqual(self.task11.key, "XXX-1")
+        self.assertEqual(self.task12.key, "XXX-2")
+        self.assertEqual(self.task21.key, "ODOO-1")
+        # The key column is not written anymore
+        self.env.flush_all()
+        self.env.cr.execute(
+            "SELECT key FROM project_task WHERE id = %s", (self.task11.id,)
+        )
+        self.assertIsNone(self.env.cr.fetchone()[0])
+
+    def test_switch_project(self):
+        self.task11.write({"project_id": self.project_2.id})
+        self.assertEqual(self.task11.key, "ODOO-2")
+        self.assertEqual(self.task12.key, "ODOO-3")
+
+    def test_search_key(self):
+        Task = self.Task
+        self.assertEqual(Task.search([("key", "=", "OCA-1")]), self.task11)
+        self.assertEqual(
+            Task.search([("key", "in", ["OCA-2", "ODOO-1"])]), self.task12 | self.task21
+        )
+        self.assertEqual(Task.search([("key", "=ilike", "oca-2")]), self.task12)
+        self.assertEqual(
+            Task.search([("key", "=like", "OCA-%")]), self.task11 | self.task12
+        )
+        self.assertEqual(Task.search([("key", "=like", "OCA-2%")]), self.task12)
+        self.assertEqual(
+            Task.search([("key", "ilike", "ca-")]), self.task11 | self.task12
+        )
+        self.assertIn(self.task30, Task.search([("key", "=", False)]))
+        self.assertNotIn(self.task11, Task.search([("key", "!=", "OCA-1")]))
+        self.assertIn(self.task12, Task.search([("key", "!=", "OCA-1")]))
+
+    def test_name_search_key_prefix(self):
+        tasks = self.Task.create(
+            [{"name": str(i), "project_id": self.project_1.id} for i in range(10)]
+        )
+        task_ids = [x[0] for x in self.Task.name_search("oca-1")]
+        self.assertEqual(task_ids, [self.task11.id] + tasks[-3:].ids)
@@ -1,7 +1,21 @@
 # Copyright 2019 Therp BV <https://therp.nl>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
+from collections import defaultdict
+
 from odoo import api, fields, models
+from odoo.exceptions import UserError, ValidationError
+from odoo.osv import expression
+from odoo.tools.sql import create_index
+
+from odoo.addons.project.models.project_task import CLOSED_STATES
+
+SUBTREE_TOTAL_FIELDS = [
+    "subtree_task_count",
+    "subtree_open_task_count",
+    "subtree_allocated_hours",
+    "subtree_open_milestone_count",
+]
 
 
 class Project(models.Model):
@@ -19,12 +33,138 @@ class Project(models.Model):
     parent_path = fields.Char(index="btree")
 
     child_ids_count = fields.Integer(compute="_compute_child_ids_count", store=True)
+    # Totals of the project and all its descendants
+    subtree_task_count = fields.Integer(
+        string="Portfolio Tasks", compute="_compute_subtree_totals"
+    )
+    subtree_open_task_count = fields.Integer(
+        string="Portfolio Open Tasks", compute="_compute_subtree_totals"
+    )
+    subtree_allocated_hours = fields.Float(
+        string="Portfolio Allocated Hours", compute="_compute_subtree_totals"
+    )
+    subtree_open_milestone_count = fields.Integer(
+        string="Portfolio Open Milestones", compute="_compute_subtree_totals"
+    )
 
     @api.depends("child_ids")
     def _compute_child_ids_count(self):
         for project in self:
             project.child_ids_count = len(project.child_ids)
 
+    def _auto_init(self):
+        res = super()._auto_init()
+        # Allow the `parent_path LIKE 'x/%'` subtree lookups to use an index
+        # whatever the database collation
+        create_index(
+            self.env.cr,
+            "project_project_parent_path_pattern_index",
+            "project_project",
+            ["parent_path text_pattern_ops"],
+        )
+        return res
+
+    def _compute_subtree_totals(self):
+        totals = self._get_subtree_totals()
+        for project in self:
+            project.update(
+                totals.get(project.id, dict.fromkeys(SUBTREE_TOTAL_FIELDS, 0))
+            )
+
+    def _get_subtree_totals(self):
+        """Return the totals of the current projects and all their
+        descendants, as {project_id: {field name: value}}. Only the
+        projects, tasks and milestones the user can read are counted."""
+        projects = self.browse(self.ids)
+        if not projects:
+            return {}
+        # Constant prefixes, as for child_of, so that the pattern index on
+        # parent_path serves the lookup of the descendants
+        descendants = projects.with_context(active_test=False).search_fetch(
+            expression.OR(
+                [
+                    [("parent_path", "=like", f"{path}%")]
+                    for path in projects.mapped("parent_path")
+                ]
+            ),
+            ["parent_path"],
+        )
+        own_totals = defaultdict(lambda: dict.fromkeys(SUBTREE_TOTAL_FIELDS, 0))
+        for project, state, count, hours in self.env["project.task"]._read_group(
+            [("project_id", "in", descendants.ids)],
+            ["project_id", "state"],
+            ["__count", "allocated_hours:sum"],
+        ):
+            values = own_totals[project.id]
+            values["subtree_task_count"] += count
+            if state not in CLOSED_STATES:
+                values["subtree_open_task_count"] += count
+            values["subtree_allocated_hours"] += hours or 0
+        for project, count in self.env["project.milestone"]._read_group(
+            [("project_id", "in", descendants.ids), ("is_reached", "=", False)],
+            ["project_id"],
+            ["__count"],
+        ):
+            own_totals[project.id]["subtree_open_milestone_count"] += count
+        totals = {
+            project_id: dict.fromkeys(SUBTREE_TOTAL_FIELDS, 0)
+            for project_id in projects.ids
+        }
+        for descendant in descendants:
+            if descendant.id not in own_totals:
+                continue
+            for ancestor_id in map(int, descendant.parent_path.split("/")[:-1]):
+                if ancestor_id in totals:
+                    for field_name, value in own_totals[descendant.id].items():
+                        totals[ancestor_id][field_name] += value
+        return totals
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "parent_id" in vals:
+            # The totals of the former and new ancestors change
+            self.invalidate_model(SUBTREE_TOTAL_FIELDS)
+        return res
+
+    @api.model
+    def get_project_tree_nodes(self, parent_id=False, after_id=0, limit=80):
+        """Return one page of the direct children of a project, or of the
+        top-level projects, for tree widgets expanding nodes on demand.
+
+        The pages are keyed on the project id: pass the ``next_after_id`` of a
+        result as ``after_id`` to get the following page.
+
+        :return: dict with the ``nodes`` (id, name, parent_path, child_count,
+            open_task_count) and ``next_after_id`` (False on the last page)
+        """
+        limit = max(int(limit), 1)
+        domain = [("parent_id", "=", parent_id or False)]
+        if after_id:
+            domain.append(("id", ">", after_id))
+        projects = self.search_fetch(
+            domain,
+            ["name", "parent_path", "child_ids_count"],
+            limit=limit + 1,
+            order="id",
+        )
+        next_after_id = False
+        if len(projects) > limit:
+            projects = projects[:limit]
+            next_after_id = projects[-1].id
+        return {
+            "nodes": [
+                {
+                    "id": project.id,
+                    "name": project.name,
+                    "parent_path": project.parent_path,
+                    "child_count": project.child_ids_count,
+                    "open_task_count": project.open_task_count,
+                }
+                for project in projects
+            ],
+            "next_after_id": next_after_id,
+        }
+
     def action_open_child_project(self):
         self.ensure_one()
         ctx = self.env.context.copy()
@@ -40,3 +180,95 @@ class Project(models.Model):
             "context": ctx,
             "domain": domain,
         }
+
+    @api.model
+    def reparent_projects(self, parent_by_project):
+        """Move many projects under new parents at once.
+
+        :param dict parent_by_project: new parent id (or False) by project id
+
+        The parents are written with one statement, checked for cycles once,
+        and the ``parent_path`` of all the moved subtrees is rebuilt in one
+        set-based pass instead of once per project. Only the child counts of
+        the former and new parents are recomputed.
+        """
+        parent_by_project = {
+            int(project_id): int(parent_id or 0) or None
+            for project_id, parent_id in parent_by_project.items()
+        }
+        if not parent_by_project:
+            return True
+        projects = self.browse(list(parent_by_project))
+        parents = self.browse(
+            sorted({pid for pid in parent_by_project.values() if pid})
+        )
+        if (projects | parents).exists() != projects | parents:
+            raise UserError(
+                self.env._("Some of the projects to reparent do not exist.")
+            )
+        projects.check_access("write")
+        parents.check_access("read")
+        self.flush_model(["parent_id", "parent_path"])
+        old_parents = projects.parent_id
+        # The affected projects are found through the former paths, with
+        # constant prefixes as for child_of so the pattern index is used
+        affected = (
+            self.sudo()
+            .with_context(active_test=False)
+            ._search(
+                expression.OR(
+                    [
+                        [("parent_path", "=like", f"{path}%")]
+                        for path in projects.mapped("parent_path")
+                    ]
+                )
+            )
+        )
+        affected_ids = tuple(affected)
+        with self.env.cr.savepoint():
+            self.env.cr.execute(
+                """
+                UPDATE project_project p
+                SET parent_id = m.parent_id, write_uid = %s,
+                    write_date = (now() at time zone 'UTC')
+                FROM unnest(%s::int[], %s::int[]) AS m(id, parent_id)
+                WHERE p.id = m.id
+                """,
+                (
+                    self.env.uid,
+                    list(parent_by_project),
+                    list(parent_by_project.values()),
+                ),
+            )
+            self.invalidate_model(["parent_id", "write_uid", "write_date"])
+            if projects._has_cycle():
+                raise ValidationError(
+                    self.env._("You cannot create recursive projects.")
+                )
+        # The new paths are built top-down from the unaffected parents
+        self.env.cr.execute(
+            """
+            WITH RECURSIVE tree AS (
+                SELECT a.id, concat(p.parent_path, a.id, '/') AS parent_path
+                FROM project_project a
+                LEFT JOIN project_project p ON p.id = a.parent_id
+                WHERE a.id IN %s
+                AND (a.parent_id IS NULL OR a.parent_id NOT IN %s)
+                UNION ALL
+                SELECT c.id, tree.parent_path || c.id || '/'
+                FROM project_project c
+                JOIN tree ON c.parent_id = tree.id
+            )
+            UPDATE project_project p
+            SET parent_path = tree.parent_path
+            FROM tree
+            WHERE p.id = tree.id
+            AND p.parent_path IS DISTINCT FROM tree.parent_path
+            """,
+            (affected_ids, affected_ids),
+        )
+        self.invalidate_model(["parent_path", "child_ids", *SUBTREE_TOTAL_FIELDS])
+        touched_parents = old_parents | parents
+        if touched_parents:
+            self.env.add_to_compute(self._fields["child_ids_count"], touched_parents)
+        return True
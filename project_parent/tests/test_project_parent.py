@@ -1,6 +1,7 @@
 # Copyright 2020 haulogy SA/NV
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from odoo.exceptions import ValidationError
 from odoo.tests.common import TransactionCase
 
 
@@ -26,3 +27,95 @@ class TestProjectParent(TransactionCase):
         self.assertEqual(
             res.get("context").get("default_parent_id"), self.project_project_1.id
         )
+
+    def test_subtree_totals(self):
+        Project = self.env["project.project"]
+        root = Project.create({"name": "Root"})
+        child = Project.create({"name": "Child", "parent_id": root.id})
+        grandchild = Project.create({"name": "Grandchild", "parent_id": child.id})
+        other = Project.create({"name": "Other"})
+        self.env["project.task"].create(
+            [
+                {"name": "Root task", "project_id": root.id, "allocated_hours": 1},
+                {"name": "Child task", "project_id": child.id, "allocated_hours": 2},
+                {
+                    "name": "Grandchild task",
+                    "project_id": grandchild.id,
+                    "allocated_hours": 4,
+                    "state": "1_done",
+                },
+            ]
+        )
+        self.env["project.milestone"].create(
+            [
+                {"name": "Open", "project_id": grandchild.id},
+                {"name": "Reached", "project_id": child.id, "is_reached": True},
+            ]
+        )
+        self.assertEqual(root.subtree_task_count, 3)
+        self.assertEqual(root.subtree_open_task_count, 2)
+        self.assertEqual(root.subtree_allocated_hours, 7)
+        self.assertEqual(root.subtree_open_milestone_count, 1)
+        self.assertEqual(child.subtree_task_count, 2)
+        self.assertEqual(other.subtree_task_count, 0)
+        # Reparenting moves the totals of the whole subtree
+        child.parent_id = other
+        self.assertEqual(root.subtree_task_count, 1)
+        self.assertEqual(root.subtree_allocated_hours, 1)
+        self.assertEqual(other.subtree_task_count, 2)
+        self.assertEqual(other.subtree_open_milestone_count, 1)
+
+    def test_reparent_projects(self):
+        Project = self.env["project.project"]
+        root = Project.create({"name": "Root"})
+        other = Project.create({"name": "Other"})
+        child = Project.create({"name": "Child", "parent_id": root.id})
+        grandchild = Project.create({"name": "Grandchild", "parent_id": child.id})
+        leaf = Project.create({"name": "Leaf", "parent_id": grandchild.id})
+        self.assertEqual(root.child_ids_count, 1)
+        Project.reparent_projects({child.id: other.id, leaf.id: root.id})
+        self.assertEqual(child.parent_id, other)
+        self.assertEqual(leaf.parent_id, root)
+        self.assertEqual(child.parent_path, f"{other.id}/{child.id}/")
+        self.assertEqual(
+            grandchild.parent_path, f"{other.id}/{child.id}/{grandchild.id}/"
+        )
+        self.assertEqual(leaf.parent_path, f"{root.id}/{leaf.id}/")
+        self.assertEqual(root.child_ids, leaf)
+        self.assertEqual(root.child_ids_count, 1)
+        self.assertEqual(other.child_ids_count, 1)
+        self.assertEqual(grandchild.child_ids_count, 0)
+        self.assertEqual(
+            Project.search([("id", "child_of", other.id)]), other | child | grandchild
+        )
+        with self.assertRaises(ValidationError):
+            Project.reparent_projects({other.id: grandchild.id})
+        self.assertFalse(other.parent_id)
+        self.assertEqual(other.parent_path, f"{other.id}/")
+
+    def test_get_project_tree_nodes(self):
+        Project = self.env["project.project"]
+        root = Project.create({"name": "Root"})
+        children = Project.create(
+            [{"name": f"Child {i}", "parent_id": root.id} for i in range(3)]
+        )
+        Project.create({"name": "Grandchild", "parent_id": children[0].id})
+        self.env["project.task"].create(
+            {"name": "Open task", "project_id": children[0].id}
+        )
+        res = Project.get_project_tree_nodes(root.id, limit=2)
+        self.assertEqual([node["id"] for node in res["nodes"]], children[:2].ids)
+        self.assertEqual(res["nodes"][0]["child_count"], 1)
+        self.assertEqual(res["nodes"][0]["open_task_count"], 1)
+        self.assertEqual(res["nodes"][0]["parent_path"], f"{root.id}/{children[0].id}/")
+        self.assertEqual(res["next_after_id"], children[1].id)
+        res = Project.get_project_tree_nodes(
+            root.id, after_id=res["next_after_id"], limit=2
+        )
+        self.assertEqual([node["id"] for node in res["nodes"]], children[2:].ids)
+        self.assertFalse(res["next_after_id"])
+        top_ids = [node["id"] for node in Project.get_project_tree_nodes()["nodes"]]
+        self.assertNotIn(children[0].id, top_ids)
+        res = Project.get_project_tree_nodes(root.id, limit=0)
+        self.assertEqual([node["id"] for node in res["nodes"]], children[:1].ids)
+        self.assertEqual(res["next_after_id"], children[0].id)
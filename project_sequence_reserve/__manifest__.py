@@ -0,0 +1,13 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+{
+    "name": "Project Sequence Reserve",
+    "summary": "Reserve blocks of sequence numbers in one query",
+    "version": "18.0.1.0.0",
+    "category": "Project",
+    "website": "https://github.com/OCA/project",
+    "author": "Odoo Community Association (OCA)",
+    "license": "LGPL-3",
+    "depends": ["base"],
+    "installable": True,
+}
@@ -0,0 +1,29 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+
+from odoo.tests.common import TransactionCase
+
+
+class TestIrSequence(TransactionCase):
+    def _create_sequence(self, implementation):
+        return self.env["ir.sequence"].create(
+            {
+                "name": "Test sequence",
+                "implementation": implementation,
+                "prefix": "T",
+                "padding": 3,
+                "number_next": 5,
+                "number_increment": 2,
+            }
+        )
+
+    def test_next_block_standard(self):
+        sequence = self._create_sequence("standard")
+        self.assertEqual(sequence._next_block(3), ["T005", "T007", "T009"])
+        self.assertEqual(sequence.next_by_id(), "T011")
+        self.assertEqual(sequence._next_block(0), [])
+
+    def test_next_block_no_gap(self):
+        sequence = self._create_sequence("no_gap")
+        self.assertEqual(sequence._next_block(3), ["T005", "T007", "T009"])
+        self.assertEqual(sequence.number_next, 11)
+        self.assertEqual(sequence.next_by_id(), "T011")
@@ -11,6 +11,7 @@
     "installable": True,
     "data": [
         "views/project_tags_views.xml",
+        "views/project_task_views.xml",
     ],
     "maintainers": ["victoralmau"],
 }
@@ -1,7 +1,9 @@
 # Copyright 2024-2025 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl)
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import ValidationError
+from odoo.osv import expression
+from odoo.tools.sql import column_exists, create_column, create_index
 
 
 class ProjectTags(models.Model):
@@ -15,18 +17,172 @@ class ProjectTags(models.Model):
         comodel_name="project.tags", inverse_name="parent_id", string="Child Tags"
     )
     parent_path = fields.Char(index=True)
+    complete_name = fields.Char(
+        compute="_compute_complete_name",
+        recursive=True,
+        store=True,
+        index=True,
+        translate=True,
+    )
+
+    def _auto_init(self):
+        # Fill the full names with one query instead of computing them level
+        # by level on install, once the parent paths are set
+        fill_complete_names = not column_exists(
+            self.env.cr, self._table, "complete_name"
+        )
+        if fill_complete_names:
+            create_column(self.env.cr, self._table, "complete_name", "jsonb")
+        res = super()._auto_init()
+        # Allow the `parent_path LIKE 'x/%'` subtree lookups to use an index
+        # whatever the database collation
+        create_index(
+            self.env.cr,
+            "project_tags_parent_path_pattern_index",
+            self._table,
+            ["parent_path text_pattern_ops"],
+        )
+        if fill_complete_names:
+            self.pool.post_init(self._init_complete_names)
+        return res
+
+    def _init_complete_names(self):
+        self.env.cr.execute("SELECT id FROM project_tags WHERE parent_path IS NOT NULL")
+        tag_ids = [row[0] for row in self.env.cr.fetchall()]
+        if tag_ids:
+            self._update_complete_names(tag_ids)
+
+    @api.depends("name", "parent_id.complete_name")
+    def _compute_complete_name(self):
+        for tag in self:
+            if tag.parent_id:
+                tag.complete_name = f"{tag.parent_id.complete_name} / {tag.name}"
+            else:
+                tag.complete_name = tag.name
 
     @api.depends("name", "parent_id")
     def _compute_display_name(self):
+        # Read the names of all the ancestors of the batch at once from the
+        # parent paths instead of walking the parents of every tag
+        stored_tags = self.filtered(lambda tag: isinstance(tag.id, int))
+        ancestor_ids = {
+            int(ancestor_id)
+            for tag in stored_tags
+            for ancestor_id in (tag.parent_path or "").split("/")
+            if ancestor_id
+        }
+        ancestors = self.browse(ancestor_ids)
+        ancestors.fetch(["name"])
         for tag in self:
-            names = []
-            current = tag
-            while current:
-                names.append(current.name)
-                current = current.parent_id
-            tag.display_name = " / ".join(reversed(names))
+            if tag in stored_tags and tag.parent_path:
+                names = [
+                    ancestors.browse(int(ancestor_id)).name
+                    for ancestor_id in tag.parent_path.split("/")[:-2]
+                ]
+                names.append(tag.name)
+            else:
+                names = []
+                current = tag
+                while current:
+                    names.insert(0, current.name)
+                    current = current.parent_id
+            tag.display_name = " / ".join(names)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if any(vals.get("parent_id") for vals in vals_list):
+            self.env.registry.clear_cache()
+        tags = super().create(vals_list)
+        # The ORM computes the full names in the current language only
+        tags.flush_recordset(["complete_name"])
+        self._update_complete_names(tags.ids)
+        tags.invalidate_recordset(["complete_name"])
+        return tags
+
+    def unlink(self):
+        self.env.registry.clear_cache()
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache("tag_ids")
+    def _get_tag_tree_ids(self, tag_ids):
+        """Return the ids of the given tags and all their descendants.
+
+        Cached until the tag tree changes, i.e. a tag is moved, created
+        under a parent or deleted.
+        """
+        # Constant prefixes, as for child_of, so that the index on
+        # parent_path serves the lookup; the cached ids ignore record rules
+        tags = self.sudo().browse(tag_ids).exists()
+        if not tags:
+            return ()
+        tree = tags._search(
+            expression.OR(
+                [
+                    [("parent_path", "=like", f"{path}%")]
+                    for path in tags.mapped("parent_path")
+                ]
+            )
+        )
+        return tuple(sorted(tree))
 
     @api.constrains("parent_id")
     def _check_parent_id(self):
         if self._has_cycle():
             raise ValidationError(_("You can not create recursive tags."))
+
+    def write(self, vals):
+        if "parent_id" in vals:
+            self.env.registry.clear_cache()
+        if not self or ("name" not in vals and "parent_id" not in vals):
+            return super().write(vals)
+        # Keep the ORM from recomputing the full names of the subtree level
+        # by level, they are set in one statement afterwards. The subtree is
+        # searched as superuser so no descendant is left with a stale name.
+        subtree = self.sudo().search([("id", "child_of", self.ids)])
+        with self.env.protecting([self._fields["complete_name"]], subtree):
+            res = super().write(vals)
+            self.flush_model(["name", "parent_id", "parent_path"])
+            self._update_complete_names(subtree.ids)
+            self.env.remove_to_compute(self._fields["complete_name"], subtree)
+            subtree.invalidate_recordset(["complete_name"])
+        return res
+
+    @api.model
+    def _update_complete_names(self, tag_ids):
+        """Set the full names of the given tags from their parent paths, in
+        all the installed languages."""
+        if not tag_ids:
+            return
+        langs = {code for code, __ in self.env["res.lang"].get_installed()}
+        langs.add("en_US")
+        self.env.cr.execute(
+            """
+            UPDATE project_tags t
+            SET complete_name = n.complete_name
+            FROM (
+                SELECT l.id, jsonb_object_agg(l.lang, l.complete_name) AS complete_name
+                FROM (
+                    SELECT
+                        t.id,
+                        lang.code AS lang,
+                        string_agg(
+                            COALESCE(a.name->>lang.code, a.name->>'en_US'),
+                            ' / ' ORDER BY p.depth
+                        ) AS complete_name
+                    FROM project_tags t
+                    CROSS JOIN unnest(%s::varchar[]) AS lang(code)
+                    CROSS JOIN LATERAL unnest(
+                        string_to_array(rtrim(t.parent_path, '/'), '/')::int[]
+                    ) WITH ORDINALITY AS p(id, depth)
+                    JOIN project_tags a ON a.id = p.id
+                    WHERE t.id IN %s
+                    GROUP BY t.id, lang.code
+                ) l
+                GROUP BY l.id
+            ) n
+            WHERE t.id = n.id
+            AND t.complete_name IS DISTINCT FROM n.complete_name
+            """,
+            (sorted(langs), tuple(tag_ids)),
+        )
@@ -0,0 +1,62 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl)
+from odoo import api, fields, models
+from odoo.osv import expression
+from odoo.tools import SQL
+
+
+class ProjectTask(models.Model):
+    _inherit = "project.task"
+
+    tag_tree_ids = fields.Many2many(
+        comodel_name="project.tags",
+        string="Tags (with Sub-tags)",
+        compute="_compute_tag_tree_ids",
+        search="_search_tag_tree_ids",
+    )
+
+    def _compute_tag_tree_ids(self):
+        for task in self:
+            task.tag_tree_ids = task.tag_ids
+
+    def _search_tag_tree_ids(self, operator, value):
+        """Search the tasks having the given tags or any of their sub-tags."""
+        if operator not in ("in", "not in", "=", "!=", "ilike", "not ilike"):
+            return NotImplemented
+        Tags = self.env["project.tags"]
+        if isinstance(value, str):
+            tag_ids = Tags.search([("name", "ilike", value)]).ids
+        else:
+            values = value if isinstance(value, list | tuple) else [value]
+            tag_ids = [tag_id for tag_id in values if tag_id]
+        if not tag_ids and operator in ("=", "!="):
+            return [("tag_ids", operator, False)]
+        tag_ids = Tags._get_tag_tree_ids(tuple(sorted(set(tag_ids))))
+        if operator in expression.NEGATIVE_TERM_OPERATORS:
+            return [("tag_ids", "not in", tag_ids)]
+        return [("tag_ids", "in", tag_ids)]
+
+    @api.model
+    def get_tag_facet_counts(self, domain=None):
+        """Return the number of tasks matching the domain per top-level tag,
+        counting the tasks tagged with any tag of its tree, as
+        {top-level tag id: count}."""
+        field = self._fields["tag_ids"]
+        query = self._search(domain or [])
+        self.env["project.tags"].flush_model(["parent_path"])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT split_part(tag.parent_path, '/', 1)::int, count(DISTINCT rel.%s)
+                FROM %s rel
+                JOIN project_tags tag ON tag.id = rel.%s
+                WHERE rel.%s IN %s
+                GROUP BY 1
+                """,
+                SQL.identifier(field.column1),
+                SQL.identifier(field.relation),
+                SQL.identifier(field.column2),
+                SQL.identifier(field.column1),
+                query.subselect(),
+            )
+        )
+        return dict(self.env.cr.fetchall())
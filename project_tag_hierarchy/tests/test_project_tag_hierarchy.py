@@ -20,3 +20,93 @@ class TestProjectTagHierarchy(BaseCommon):
         self.assertEqual(self.tag_1.display_name, "Tag 1")
         self.assertEqual(self.tag_2.display_name, "Tag 1 / Tag 2")
         self.assertEqual(self.tag_3.display_name, "Tag 1 / Tag 2 / Tag 3")
+
+    def test_project_tag_display_name_batch(self):
+        tags = self.tag_1 | self.tag_2 | self.tag_3
+        tags.invalidate_recordset()
+        with self.assertQueryCount(2):
+            self.assertEqual(
+                tags.mapped("display_name"),
+                ["Tag 1", "Tag 1 / Tag 2", "Tag 1 / Tag 2 / Tag 3"],
+            )
+
+    def test_project_tag_complete_name(self):
+        self.assertEqual(self.tag_3.complete_name, "Tag 1 / Tag 2 / Tag 3")
+        self.tag_1.name = "Root"
+        self.assertEqual(self.tag_2.complete_name, "Root / Tag 2")
+        self.assertEqual(self.tag_3.complete_name, "Root / Tag 2 / Tag 3")
+        self.tag_2.parent_id = False
+        self.assertEqual(self.tag_2.complete_name, "Tag 2")
+        self.assertEqual(self.tag_3.complete_name, "Tag 2 / Tag 3")
+        tag_4 = self.env["project.tags"].create(
+            {"name": "Tag 4", "parent_id": self.tag_3.id}
+        )
+        self.assertEqual(tag_4.complete_name, "Tag 2 / Tag 3 / Tag 4")
+
+    def test_project_tag_complete_name_translated(self):
+        self.env["res.lang"]._activate_lang("fr_FR")
+        self.tag_1.with_context(lang="fr_FR").name = "Étiquette 1"
+        self.assertEqual(
+            self.tag_3.with_context(lang="fr_FR").complete_name,
+            "Étiquette 1 / Tag 2 / Tag 3",
+        )
+        self.assertEqual(
+            self.tag_3.with_context(lang="en_US").complete_name, "Tag 1 / Tag 2 / Tag 3"
+        )
+
+    def test_project_tag_complete_name_all_languages(self):
+        self.env["res.lang"]._activate_lang("fr_FR")
+        tag_fr = (
+            self.env["project.tags"]
+            .with_context(lang="fr_FR")
+            .create({"name": "Enfant", "parent_id": self.tag_3.id})
+        )
+        self.tag_2.with_context(lang="fr_FR").name = "Étiquette 2"
+        # Moving the tag as a French user rebuilds every language
+        self.tag_2.with_context(lang="fr_FR").parent_id = False
+        self.assertEqual(
+            tag_fr.with_context(lang="fr_FR").complete_name,
+            "Étiquette 2 / Tag 3 / Enfant",
+        )
+        self.assertEqual(
+            tag_fr.with_context(lang="en_US").complete_name, "Tag 2 / Tag 3 / Enfant"
+        )
+
+    def test_project_task_tag_tree_search(self):
+        Task = self.env["project.task"]
+        project = self.env["project.project"].create({"name": "Test Project"})
+        tag_other = self.env["project.tags"].create({"name": "Other"})
+        task_1 = Task.create(
+            {"name": "Task 1", "project_id": project.id, "tag_ids": self.tag_1.ids}
+        )
+        task_3 = Task.create(
+            {"name": "Task 3", "project_id": project.id, "tag_ids": self.tag_3.ids}
+        )
+        task_other = Task.create(
+            {"name": "Other", "project_id": project.id, "tag_ids": tag_other.ids}
+        )
+        domain = [("project_id", "=", project.id)]
+        self.assertEqual(
+            Task.search(domain + [("tag_tree_ids", "in", self.tag_1.ids)]),
+            task_1 | task_3,
+        )
+        self.assertEqual(
+            Task.search(domain + [("tag_tree_ids", "=", self.tag_2.id)]), task_3
+        )
+        self.assertEqual(
+            Task.search(domain + [("tag_tree_ids", "ilike", "Tag 2")]), task_3
+        )
+        self.assertEqual(
+            Task.search(domain + [("tag_tree_ids", "not in", self.tag_1.ids)]),
+            task_other,
+        )
+        # The cached tree follows the moves of the tags
+        self.tag_2.parent_id = tag_other
+        self.assertEqual(
+            Task.search(domain + [("tag_tree_ids", "in", tag_other.ids)]),
+            task_3 | task_other,
+        )
+        self.assertEqual(
+            Task.get_tag_facet_counts(domain),
+            {self.tag_1.id: 1, tag_other.id: 2},
+        )
@@ -6,7 +6,9 @@ from odoo import fields, models
 class Projectproject(models.Model):
     _inherit = "project.project"
 
-    tag_ids = fields.Many2many(
-        domain="""['|', ('allowed_project_ids', 'in', [id]),
-        ('allowed_project_ids', '=', False)]"""
-    )
+    tag_ids = fields.Many2many(domain="[('allowed_for_project_id', '=', id)]")
+
+    def unlink(self):
+        # Tags only allowed for the deleted projects become unrestricted
+        self.env.registry.clear_cache()
+        return super().unlink()
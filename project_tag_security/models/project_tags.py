@@ -1,6 +1,6 @@
 # Copyright 2024 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl)
-from odoo import fields, models
+from odoo import api, fields, models, tools
 
 
 class ProjectTags(models.Model):
@@ -13,3 +13,74 @@ class ProjectTags(models.Model):
         column2="project_id",
         string="Allowed Projects",
     )
+    allowed_for_project_id = fields.Many2one(
+        comodel_name="project.project",
+        compute="_compute_allowed_for_project_id",
+        search="_search_allowed_for_project_id",
+        help="Technical field to search the tags allowed for a project: the "
+        "tags without allowed projects and the ones allowing it.",
+    )
+
+    def _compute_allowed_for_project_id(self):
+        self.allowed_for_project_id = False
+
+    def _search_allowed_for_project_id(self, operator, value):
+        if operator != "=":
+            return NotImplemented
+        return list(self._get_project_tag_domain(value or False))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # The cached domains may list the allowed tags, new ones included
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if "allowed_project_ids" in vals:
+            self.env.registry.clear_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        if self.allowed_project_ids:
+            self.env.registry.clear_cache()
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache()
+    def _get_tag_allowed_project_map(self):
+        """Return the allowed projects of the restricted tags, as
+        {tag id: frozenset of project ids}."""
+        self.flush_model(["allowed_project_ids"])
+        self.env.cr.execute(
+            """
+            SELECT tag_id, array_agg(project_id)
+            FROM project_tags_allowed_project_rel
+            GROUP BY tag_id
+            """
+        )
+        return {
+            tag_id: frozenset(project_ids)
+            for tag_id, project_ids in self.env.cr.fetchall()
+        }
+
+    @api.model
+    @tools.ormcache()
+    def _get_tag_ids(self):
+        self.env.cr.execute("SELECT id FROM project_tags")
+        return frozenset(row[0] for row in self.env.cr.fetchall())
+
+    @api.model
+    @tools.ormcache("project_id")
+    def _get_project_tag_domain(self, project_id):
+        """Return the domain of the tags that can be used in the given
+        project, listing either the allowed tags or the excluded ones,
+        whichever is smaller."""
+        excluded_ids = {
+            tag_id
+            for tag_id, project_ids in self._get_tag_allowed_project_map().items()
+            if project_id not in project_ids
+        }
+        allowed_ids = self._get_tag_ids() - excluded_ids
+        if len(allowed_ids) < len(excluded_ids):
+            return (("id", "in", tuple(sorted(allowed_ids))),)
+        return (("id", "not in", tuple(sorted(excluded_ids))),)
@@ -6,7 +6,4 @@ from odoo import fields, models
 class ProjectTask(models.Model):
     _inherit = "project.task"
 
-    tag_ids = fields.Many2many(
-        domain="""['|', ('allowed_project_ids', 'in', [project_id]),
-        ('allowed_project_ids', '=', False)]"""
-    )
+    tag_ids = fields.Many2many(domain="[('allowed_for_project_id', '=', project_id)]")
@@ -51,3 +51,49 @@ class TestProjectTagSecurity(BaseCommon):
         self.assertIn(self.tag_1, tags)
         self.assertNotIn(self.tag_2, tags)
         self.assertNotIn(self.tag_3, tags)
+
+    def test_project_tags_allowed_for_project(self):
+        Tags = self.env["project.tags"]
+        for project in self.project_1 | self.project_2 | self.project_3:
+            self.assertEqual(
+                Tags.search([("allowed_for_project_id", "=", project.id)]),
+                self._get_project_tags(project.id),
+            )
+        self.assertEqual(
+            Tags.search([("allowed_for_project_id", "=", False)]),
+            Tags.search([("allowed_project_ids", "=", False)]),
+        )
+        # The cached map follows the changes of the allowed projects
+        self.tag_2.allowed_project_ids |= self.project_3
+        tags = Tags.search([("allowed_for_project_id", "=", self.project_3.id)])
+        self.assertIn(self.tag_2, tags)
+        self.assertNotIn(self.tag_3, tags)
+        self.tag_3.allowed_project_ids = False
+        tags = Tags.search([("allowed_for_project_id", "=", self.project_3.id)])
+        self.assertIn(self.tag_3, tags)
+
+    def test_project_tags_many_restricted(self):
+        Tags = self.env["project.tags"]
+        restricted_tags = Tags.create(
+            [
+                {"name": f"Restricted {i}", "allowed_project_ids": [self.project_1.id]}
+                for i in range(300)
+            ]
+        )
+        # Mostly restricted tags are listed as the few allowed ones
+        domain = Tags._get_project_tag_domain(self.project_3.id)
+        self.assertEqual(domain[0][1], "in")
+        tags = Tags.search([("allowed_for_project_id", "=", self.project_3.id)])
+        self.assertEqual(tags, self._get_project_tags(self.project_3.id))
+        self.assertIn(self.tag_1, tags)
+        self.assertFalse(tags & restricted_tags)
+        # Mostly allowed tags are listed as the few excluded ones
+        domain = Tags._get_project_tag_domain(self.project_1.id)
+        self.assertEqual(domain[0][1], "not in")
+        tags = Tags.search([("allowed_for_project_id", "=", self.project_1.id)])
+        self.assertEqual(tags, self._get_project_tags(self.project_1.id))
+        self.assertLessEqual(restricted_tags, tags)
+        # New unrestricted tags are allowed at once
+        new_tag = Tags.create({"name": "New tag"})
+        tags = Tags.search([("allowed_for_project_id", "=", self.project_3.id)])
+        self.assertIn(new_tag, tags)
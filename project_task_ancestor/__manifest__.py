@@ -12,7 +12,11 @@
     "depends": ["hr_timesheet"],
     "maintainers": ["rafaelbn", "chienandalu", "Andrii9090"],
     "data": [
+        "security/ir.model.access.csv",
+        "security/project_task_ancestor_security.xml",
+        "data/ir_cron.xml",
         "views/hr_timesheet_views.xml",
         "views/project_task_views.xml",
+        "views/project_task_ancestor_rollup_views.xml",
     ],
 }
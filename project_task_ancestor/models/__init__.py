@@ -1,4 +1,5 @@
 from . import account_analytic_line
 from . import project_task
+from . import project_task_ancestor_rollup
 from . import project_report
 from . import timesheets_analysis_report
@@ -1,14 +1,58 @@
 # Copyright 2025 Moduon Team S.L.
 # License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl-3.0)
-from odoo import fields, models
+from odoo import api, fields, models
+
+# Line fields the ancestor task totals depend on, directly or through the
+# amount the timesheet post-processing derives from them
+ROLLUP_LINE_FIELDS = {"account_id", "amount", "employee_id", "task_id", "unit_amount"}
 
 
 class AccountAnalyticLine(models.Model):
     _inherit = "account.analytic.line"
 
+    # Not related to task_id.ancestor_id: ancestor changes are propagated to
+    # the lines by a batched cron, see project.task ancestor_timesheet_pending
     ancestor_task_id = fields.Many2one(
         comodel_name="project.task",
-        related="task_id.ancestor_id",
+        compute="_compute_ancestor_task_id",
         store=True,
         index="btree_not_null",
     )
+
+    @api.depends("task_id")
+    def _compute_ancestor_task_id(self):
+        for line in self:
+            line.ancestor_task_id = line.task_id.ancestor_id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if self.env.context.get("skip_ancestor_rollup"):
+            return super().create(vals_list)
+        # The timesheet post-processing writes the amount of the new lines
+        # from within create: only this outermost call updates the totals
+        lines = super(
+            AccountAnalyticLine, self.with_context(skip_ancestor_rollup=True)
+        ).create(vals_list)
+        Rollup = self.env["project.task.ancestor.rollup"]
+        Rollup._apply_contributions({}, Rollup._get_line_contributions(lines.ids))
+        return lines.with_env(self.env)
+
+    def write(self, vals):
+        if self.env.context.get("skip_ancestor_rollup") or not (
+            ROLLUP_LINE_FIELDS & vals.keys()
+        ):
+            return super().write(vals)
+        Rollup = self.env["project.task.ancestor.rollup"]
+        before = Rollup._get_line_contributions(self.ids)
+        res = super(
+            AccountAnalyticLine, self.with_context(skip_ancestor_rollup=True)
+        ).write(vals)
+        Rollup._apply_contributions(before, Rollup._get_line_contributions(self.ids))
+        return res
+
+    def unlink(self):
+        Rollup = self.env["project.task.ancestor.rollup"]
+        before = Rollup._get_line_contributions(self.ids)
+        res = super().unlink()
+        Rollup._apply_contributions(before, {})
+        return res
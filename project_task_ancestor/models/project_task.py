@@ -1,6 +1,18 @@
 # Copyright 2025 Moduon Team S.L.
 # License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl-3.0)
+import threading
+
 from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+# Task fields the ancestor task totals depend on
+ROLLUP_TASK_FIELDS = {
+    "active",
+    "allocated_hours",
+    "parent_id",
+    "stage_id",
+    "state",
+}
 
 
 class ProjectTask(models.Model):
@@ -14,8 +26,224 @@ class ProjectTask(models.Model):
         recursive=True,
         store=True,
     )
+    ancestor_timesheet_pending = fields.Boolean(
+        help="The ancestor changed and still has to be propagated to the "
+        "timesheet lines of the task.",
+        compute="_compute_ancestor_id",
+        copy=False,
+        recursive=True,
+        store=True,
+    )
+
+    def _auto_init(self):
+        res = super()._auto_init()
+        create_index(
+            self.env.cr,
+            "project_task_ancestor_timesheet_pending_index",
+            "project_task",
+            ["id"],
+            where="ancestor_timesheet_pending",
+        )
+        return res
 
     @api.depends("parent_id.ancestor_id")
     def _compute_ancestor_id(self):
+        # The database still holds the former values: flag the tasks with
+        # timesheet lines whose ancestor changes, the cron updates the lines.
+        stored_ids = tuple(task_id for task_id in self._ids if isinstance(task_id, int))
+        former = {}
+        if stored_ids:
+            self.env["account.analytic.line"].flush_model(["task_id"])
+            self.env.cr.execute(
+                """
+                SELECT t.id, t.ancestor_id, t.ancestor_timesheet_pending
+                FROM project_task t
+                WHERE t.id IN %s
+                AND EXISTS (
+                    SELECT 1 FROM account_analytic_line l WHERE l.task_id = t.id
+                )
+                """,
+                (stored_ids,),
+            )
+            former = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        newly_pending = False
         for task in self:
-            task.ancestor_id = task.parent_id.ancestor_id or task.parent_id
+            ancestor = task.parent_id.ancestor_id or task.parent_id
+            task.ancestor_id = ancestor
+            if task.id not in former:
+                task.ancestor_timesheet_pending = False
+                continue
+            former_ancestor_id, pending = former[task.id]
+            changed = (former_ancestor_id or False) != ancestor.id
+            task.ancestor_timesheet_pending = pending or changed
+            newly_pending = newly_pending or (changed and not pending)
+        if newly_pending:
+            self._trigger_sync_timesheet_ancestor()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        tasks = super().create(vals_list)
+        Rollup = self.env["project.task.ancestor.rollup"]
+        Rollup._apply_contributions({}, Rollup._get_task_contributions(tasks.ids))
+        return tasks
+
+    def write(self, vals):
+        if not self:
+            return super().write(vals)
+        Rollup = self.env["project.task.ancestor.rollup"]
+        # Reparenting changes the ancestor of the whole subtree
+        subtree = self._get_subtree() if "parent_id" in vals else self
+        update_rollup = not ROLLUP_TASK_FIELDS.isdisjoint(vals)
+        if update_rollup:
+            before = Rollup._get_task_contributions(subtree.ids)
+        if "parent_id" not in vals:
+            res = super().write(vals)
+        else:
+            # Keep the ORM from marking the whole subtree level by level, the
+            # ancestors are set in one statement afterwards.
+            with self.env.protecting(self._get_ancestor_fields(), subtree):
+                res = super().write(vals)
+                self._update_subtree_ancestor_ids(subtree)
+        if update_rollup:
+            Rollup._apply_contributions(
+                before, Rollup._get_task_contributions(subtree.ids)
+            )
+        if "project_id" in vals or "company_id" in vals:
+            Rollup._update_ancestor_projects(self.ids)
+        return res
+
+    def unlink(self):
+        # The children of the deleted tasks become ancestors of their own
+        # subtasks
+        if not self:
+            return super().unlink()
+        Rollup = self.env["project.task.ancestor.rollup"]
+        subtree = self._get_subtree()
+        before = Rollup._get_task_contributions(subtree.ids)
+        res = super().unlink()
+        Rollup._apply_contributions(
+            before, Rollup._get_task_contributions((subtree - self).exists().ids)
+        )
+        return res
+
+    def _get_ancestor_fields(self):
+        return [self._fields["ancestor_id"], self._fields["ancestor_timesheet_pending"]]
+
+    def _get_subtree(self):
+        """Return the current tasks and all their descendants."""
+        self.flush_model(["parent_id"])
+        self.env.cr.execute(
+            """
+            WITH RECURSIVE subtree AS (
+              SELECT id FROM project_task WHERE id IN %s
+              UNION
+              SELECT t.id
+              FROM project_task t
+              INNER JOIN subtree s ON t.parent_id = s.id
+            )
+            SELECT id FROM subtree
+            """,
+            (tuple(self.ids),),
+        )
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    def _update_subtree_ancestor_ids(self, subtree):
+        """Set the ancestor of the current tasks and their descendants, given
+        as subtree, with one recursive query."""
+        self.flush_model(["parent_id", "ancestor_id"])
+        self.env["account.analytic.line"].flush_model(["task_id"])
+        self.env.cr.execute(
+            """
+            WITH RECURSIVE up AS (
+              SELECT id AS task_id, id AS node_id, parent_id
+              FROM project_task
+              WHERE id IN %s
+              UNION ALL
+              SELECT up.task_id, p.id, p.parent_id
+              FROM up
+              INNER JOIN project_task p ON p.id = up.parent_id
+            ), down AS (
+              SELECT task_id AS id, NULLIF(node_id, task_id) AS ancestor_id
+              FROM up
+              WHERE parent_id IS NULL
+              UNION ALL
+              SELECT c.id, COALESCE(down.ancestor_id, down.id)
+              FROM down
+              INNER JOIN project_task c ON c.parent_id = down.id
+            )
+            UPDATE project_task t
+            SET ancestor_id = down.ancestor_id,
+                ancestor_timesheet_pending = t.ancestor_timesheet_pending
+                    OR EXISTS (
+                        SELECT 1 FROM account_analytic_line l WHERE l.task_id = t.id
+                    )
+            FROM down
+            WHERE t.id = down.id
+            AND t.ancestor_id IS DISTINCT FROM down.ancestor_id
+            RETURNING t.id, t.ancestor_timesheet_pending
+            """,
+            (tuple(self.ids),),
+        )
+        rows = self.env.cr.fetchall()
+        updated = self.browse([row[0] for row in rows])
+        for field in self._get_ancestor_fields():
+            self.env.remove_to_compute(field, subtree)
+        if updated:
+            updated.invalidate_recordset(["ancestor_id", "ancestor_timesheet_pending"])
+            # Only the fields depending on the ancestor are marked, the subtree
+            # being protected.
+            updated.modified(["ancestor_id"])
+        if any(pending for __, pending in rows):
+            self._trigger_sync_timesheet_ancestor()
+
+    @api.model
+    def _trigger_sync_timesheet_ancestor(self):
+        # The cron does not exist yet while the module is being installed
+        cron = self.env.ref(
+            "project_task_ancestor.ir_cron_sync_timesheet_ancestor",
+            raise_if_not_found=False,
+        )
+        if cron:
+            cron._trigger()
+
+    @api.model
+    def _cron_sync_timesheet_ancestor(self, chunk_size=1000):
+        """Propagate the ancestor of the pending tasks to their timesheet
+        lines, one chunk of tasks per transaction."""
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        while True:
+            self.env.cr.execute(
+                """
+                SELECT id FROM project_task
+                WHERE ancestor_timesheet_pending
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+                """,
+                (chunk_size,),
+            )
+            task_ids = tuple(row[0] for row in self.env.cr.fetchall())
+            if not task_ids:
+                break
+            self.env.cr.execute(
+                """
+                UPDATE account_analytic_line l
+                SET ancestor_task_id = t.ancestor_id
+                FROM project_task t
+                WHERE l.task_id = t.id
+                AND t.id IN %s
+                AND l.ancestor_task_id IS DISTINCT FROM t.ancestor_id
+                """,
+                (task_ids,),
+            )
+            self.env.cr.execute(
+                """
+                UPDATE project_task
+                SET ancestor_timesheet_pending = FALSE
+                WHERE id IN %s
+                """,
+                (task_ids,),
+            )
+            self.env["account.analytic.line"].invalidate_model(["ancestor_task_id"])
+            self.invalidate_model(["ancestor_timesheet_pending"])
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
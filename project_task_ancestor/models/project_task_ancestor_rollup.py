@@ -0,0 +1,228 @@
+# Copyright 2025 Moduon Team S.L.
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl-3.0)
+from odoo import api, fields, models
+
+from odoo.addons.project.models.project_task import CLOSED_STATES
+
+# Totals kept per ancestor, in the column order of the contribution queries
+ROLLUP_TOTALS = [
+    "subtask_count",
+    "open_subtask_count",
+    "closed_subtask_count",
+    "allocated_hours",
+    "effective_hours",
+    "timesheet_cost",
+]
+
+
+class ProjectTaskAncestorRollup(models.Model):
+    """Totals of the descendant tasks of every ancestor task.
+
+    Task and timesheet changes add the difference of their contribution to
+    the totals of the ancestors they touch, see ``_apply_contributions``, so
+    grouping by ancestor does not have to sum all the tasks and timesheet
+    lines again.
+    """
+
+    _name = "project.task.ancestor.rollup"
+    _description = "Ancestor Task Totals"
+    _rec_name = "ancestor_id"
+    _order = "ancestor_id"
+    _log_access = False
+
+    ancestor_id = fields.Many2one(
+        comodel_name="project.task",
+        string="Ancestor Task",
+        ondelete="cascade",
+        readonly=True,
+        required=True,
+        index=True,
+    )
+    project_id = fields.Many2one(
+        comodel_name="project.project",
+        readonly=True,
+        index="btree_not_null",
+    )
+    company_id = fields.Many2one(
+        comodel_name="res.company",
+        readonly=True,
+        index="btree_not_null",
+    )
+    currency_id = fields.Many2one(related="company_id.currency_id")
+    subtask_count = fields.Integer(string="Subtasks", readonly=True)
+    open_subtask_count = fields.Integer(string="Open Subtasks", readonly=True)
+    closed_subtask_count = fields.Integer(string="Closed Subtasks", readonly=True)
+    allocated_hours = fields.Float(readonly=True)
+    effective_hours = fields.Float(string="Hours Spent", readonly=True)
+    timesheet_cost = fields.Monetary(
+        readonly=True,
+        groups="hr_timesheet.group_hr_timesheet_approver",
+    )
+
+    _sql_constraints = [
+        (
+            "ancestor_id_uniq",
+            "unique (ancestor_id)",
+            "There can only be one total per ancestor task.",
+        ),
+    ]
+
+    def init(self):
+        # Rebuild everything on install and update, once the ancestors of
+        # the tasks are computed
+        self.pool.post_init(self._rebuild)
+
+    @api.model
+    def _rebuild(self):
+        self.env["project.task"].flush_model(["ancestor_id"])
+        self.env.cr.execute("DELETE FROM project_task_ancestor_rollup")
+        self.env.cr.execute("SELECT id FROM project_task WHERE ancestor_id IS NOT NULL")
+        task_ids = [row[0] for row in self.env.cr.fetchall()]
+        self._apply_contributions({}, self._get_task_contributions(task_ids))
+
+    @api.model
+    def _get_task_contributions(self, task_ids):
+        """Return what the given tasks and their timesheet lines add to the
+        totals of their ancestors, as {ancestor id: [totals]}."""
+        if not task_ids:
+            return {}
+        self._flush_contribution_fields()
+        closed_states = tuple(CLOSED_STATES)
+        self.env.cr.execute(
+            """
+            SELECT
+                t.ancestor_id,
+                count(*),
+                count(*) FILTER (WHERE t.state NOT IN %s),
+                count(*) FILTER (WHERE t.state IN %s),
+                COALESCE(sum(t.allocated_hours), 0),
+                COALESCE(sum(ts.hours), 0),
+                COALESCE(sum(ts.cost), 0)
+            FROM project_task t
+            LEFT JOIN LATERAL (
+                SELECT sum(l.unit_amount) AS hours, -sum(l.amount)::float8 AS cost
+                FROM account_analytic_line l
+                WHERE l.task_id = t.id
+            ) ts ON TRUE
+            WHERE t.id IN %s AND t.active AND t.ancestor_id IS NOT NULL
+            GROUP BY t.ancestor_id
+            """,
+            (closed_states, closed_states, tuple(task_ids)),
+        )
+        return {row[0]: list(row[1:]) for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _get_line_contributions(self, line_ids):
+        """Return what the given timesheet lines add to the totals of the
+        ancestors of their tasks, as {ancestor id: [totals]}."""
+        if not line_ids:
+            return {}
+        self._flush_contribution_fields()
+        self.env.cr.execute(
+            """
+            SELECT
+                t.ancestor_id, 0, 0, 0, 0,
+                COALESCE(sum(l.unit_amount), 0),
+                COALESCE(-sum(l.amount)::float8, 0)
+            FROM account_analytic_line l
+            JOIN project_task t ON t.id = l.task_id
+            WHERE l.id IN %s AND t.active AND t.ancestor_id IS NOT NULL
+            GROUP BY t.ancestor_id
+            """,
+            (tuple(line_ids),),
+        )
+        return {row[0]: list(row[1:]) for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _flush_contribution_fields(self):
+        self.env["project.task"].flush_model(
+            ["ancestor_id", "active", "state", "allocated_hours"]
+        )
+        self.env["account.analytic.line"].flush_model(
+            ["task_id", "unit_amount", "amount"]
+        )
+
+    @api.model
+    def _apply_contributions(self, before, after):
+        """Add the difference between two contributions to the totals.
+
+        The rows are upserted with relative increments, so concurrent
+        changes under the same ancestor only wait for the row lock, and
+        removed once their ancestor has no subtask left.
+        """
+        ancestor_ids = []
+        deltas = []
+        for ancestor_id in before.keys() | after.keys():
+            delta = [
+                new - old
+                for old, new in zip(
+                    before.get(ancestor_id, [0] * len(ROLLUP_TOTALS)),
+                    after.get(ancestor_id, [0] * len(ROLLUP_TOTALS)),
+                    strict=True,
+                )
+            ]
+            if any(delta):
+                ancestor_ids.append(ancestor_id)
+                deltas.append(delta)
+        if not ancestor_ids:
+            return
+        columns = list(zip(*deltas, strict=True))
+        self.env.cr.execute(
+            """
+            INSERT INTO project_task_ancestor_rollup (
+                ancestor_id, project_id, company_id, subtask_count,
+                open_subtask_count, closed_subtask_count, allocated_hours,
+                effective_hours, timesheet_cost
+            )
+            SELECT d.ancestor_id, a.project_id, a.company_id, d.subtask_count,
+                d.open_subtask_count, d.closed_subtask_count, d.allocated_hours,
+                d.effective_hours, d.timesheet_cost
+            FROM unnest(
+                %s::int[], %s::int[], %s::int[], %s::int[],
+                %s::float8[], %s::float8[], %s::float8[]
+            ) AS d(
+                ancestor_id, subtask_count, open_subtask_count,
+                closed_subtask_count, allocated_hours, effective_hours,
+                timesheet_cost
+            )
+            JOIN project_task a ON a.id = d.ancestor_id
+            ON CONFLICT (ancestor_id) DO UPDATE SET
+                subtask_count = project_task_ancestor_rollup.subtask_count
+                    + EXCLUDED.subtask_count,
+                open_subtask_count = project_task_ancestor_rollup.open_subtask_count
+                    + EXCLUDED.open_subtask_count,
+                closed_subtask_count =
+                    project_task_ancestor_rollup.closed_subtask_count
+                    + EXCLUDED.closed_subtask_count,
+                allocated_hours = project_task_ancestor_rollup.allocated_hours
+                    + EXCLUDED.allocated_hours,
+                effective_hours = project_task_ancestor_rollup.effective_hours
+                    + EXCLUDED.effective_hours,
+                timesheet_cost = project_task_ancestor_rollup.timesheet_cost
+                    + EXCLUDED.timesheet_cost
+            """,
+            (ancestor_ids, *(list(column) for column in columns)),
+        )
+        self.env.cr.execute(
+            """
+            DELETE FROM project_task_ancestor_rollup
+            WHERE ancestor_id IN %s AND subtask_count <= 0
+            """,
+            (tuple(ancestor_ids),),
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _update_ancestor_projects(self, task_ids):
+        """Follow the project and company of the given ancestor tasks."""
+        self.env["project.task"].flush_model(["project_id", "company_id"])
+        self.env.cr.execute(
+            """
+            UPDATE project_task_ancestor_rollup r
+            SET project_id = a.project_id, company_id = a.company_id
+            FROM project_task a
+            WHERE a.id = r.ancestor_id AND a.id IN %s
+            """,
+            (tuple(task_ids),),
+        )
+        self.invalidate_model(["project_id", "company_id"])
@@ -1,6 +1,9 @@
 # Copyright 2025 Moduon Team S.L.
 # License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl-3.0)
 from odoo.addons.project.tests.test_project_base import TestProjectCommon
+from odoo.addons.project_task_ancestor.models.project_task_ancestor_rollup import (
+    ROLLUP_TOTALS,
+)
 
 
 class TestProjectTaskAncestor(TestProjectCommon):
@@ -37,3 +40,125 @@ class TestProjectTaskAncestor(TestProjectCommon):
         self.assertEqual(self.ancestor_task, self.task_1.ancestor_id)
         self.assertEqual(self.ancestor_task, self.task_2.ancestor_id)
         self.assertEqual(self.ancestor_task, self.task_3.ancestor_id)
+
+    def test_ancestor_task_reparent_subtree(self):
+        self.task_1.parent_id = self.ancestor_task
+        self.task_2.parent_id = self.task_1
+        self.task_3.parent_id = self.task_2
+        new_ancestor = self.env["project.task"].create(
+            {"name": "New ancestor", "project_id": self.project_pigs.id}
+        )
+        self.task_1.parent_id = new_ancestor
+        self.assertEqual(new_ancestor, self.task_1.ancestor_id)
+        self.assertEqual(new_ancestor, self.task_2.ancestor_id)
+        self.assertEqual(new_ancestor, self.task_3.ancestor_id)
+
+        self.task_2.parent_id = False
+        self.assertFalse(self.task_2.ancestor_id)
+        self.assertEqual(self.task_2, self.task_3.ancestor_id)
+        self.assertEqual(new_ancestor, self.task_1.ancestor_id)
+        # Writing on no task is a no-op
+        self.env["project.task"].write({"parent_id": new_ancestor.id})
+
+    def test_ancestor_task_timesheet_sync(self):
+        employee = self.env["hr.employee"].create(
+            {"name": "Test Employee", "user_id": self.env.user.id}
+        )
+        self.task_2.parent_id = self.task_1
+        line = self.env["account.analytic.line"].create(
+            {
+                "name": "Test Line",
+                "project_id": self.project_pigs.id,
+                "task_id": self.task_2.id,
+                "employee_id": employee.id,
+                "unit_amount": 1,
+            }
+        )
+        self.assertEqual(self.task_1, line.ancestor_task_id)
+        self.task_1.parent_id = self.ancestor_task
+        self.assertTrue(self.task_2.ancestor_timesheet_pending)
+        # Tasks without timesheet lines have nothing to propagate
+        self.assertFalse(self.task_1.ancestor_timesheet_pending)
+        subtask = self.env["project.task"].create(
+            {"name": "New subtask", "parent_id": self.task_2.id}
+        )
+        self.assertFalse(subtask.ancestor_timesheet_pending)
+        # Propagated to the timesheet lines by the cron
+        self.assertEqual(self.task_1, line.ancestor_task_id)
+        self.env["project.task"]._cron_sync_timesheet_ancestor(chunk_size=1)
+        self.assertFalse(self.task_2.ancestor_timesheet_pending)
+        self.assertEqual(self.ancestor_task, line.ancestor_task_id)
+        # Ancestor changes made by the ORM are flagged and scheduled as well
+        cron = self.env.ref("project_task_ancestor.ir_cron_sync_timesheet_ancestor")
+        self.env["ir.cron.trigger"].search([("cron_id", "=", cron.id)]).unlink()
+        self.ancestor_task.unlink()
+        self.assertEqual(self.task_1, self.task_2.ancestor_id)
+        self.assertTrue(self.task_2.ancestor_timesheet_pending)
+        self.assertTrue(self.env["ir.cron.trigger"].search([("cron_id", "=", cron.id)]))
+        self.env["project.task"]._cron_sync_timesheet_ancestor()
+        self.assertEqual(self.task_1, line.ancestor_task_id)
+
+    def test_ancestor_task_rollup(self):
+        Rollup = self.env["project.task.ancestor.rollup"]
+        employee = self.env["hr.employee"].create(
+            {"name": "Test Employee", "user_id": self.env.user.id, "hourly_cost": 10}
+        )
+        self.task_1.parent_id = self.ancestor_task
+        self.task_2.parent_id = self.task_1
+        self.task_1.allocated_hours = 3
+        self.task_2.allocated_hours = 2
+        line = self.env["account.analytic.line"].create(
+            {
+                "name": "Test Line",
+                "project_id": self.project_pigs.id,
+                "task_id": self.task_2.id,
+                "employee_id": employee.id,
+                "unit_amount": 4,
+            }
+        )
+        rollup = Rollup.search([("ancestor_id", "=", self.ancestor_task.id)])
+        self.assertEqual(rollup.subtask_count, 2)
+        self.assertEqual(rollup.open_subtask_count, 2)
+        self.assertEqual(rollup.allocated_hours, 5)
+        self.assertEqual(rollup.effective_hours, 4)
+        self.assertEqual(rollup.timesheet_cost, 40)
+        self.task_2.state = "1_done"
+        line.unit_amount = 1
+        self.assertEqual(rollup.closed_subtask_count, 1)
+        self.assertEqual(rollup.effective_hours, 1)
+        self.assertEqual(rollup.timesheet_cost, 10)
+        # Moving the subtree makes task_1 an ancestor
+        self.task_1.parent_id = False
+        self.assertFalse(rollup.exists())
+        rollup = Rollup.search([("ancestor_id", "=", self.task_1.id)])
+        self.assertEqual(rollup.subtask_count, 1)
+        self.assertEqual(rollup.allocated_hours, 2)
+        self.assertEqual(rollup.effective_hours, 1)
+        self.assertEqual(rollup.timesheet_cost, 10)
+        self.env["account.analytic.line"].create(
+            {
+                "name": "Other Line",
+                "project_id": self.project_pigs.id,
+                "task_id": self.task_2.id,
+                "employee_id": employee.id,
+                "unit_amount": 2,
+            }
+        )
+        self.assertEqual(rollup.timesheet_cost, 30)
+        line.unlink()
+        self.assertEqual(rollup.effective_hours, 2)
+        self.assertEqual(rollup.timesheet_cost, 20)
+        self.assertEqual(rollup.company_id, self.task_1.company_id)
+        # The incremental totals match a full rebuild
+        totals = {
+            total["ancestor_id"][0]: [total[field] for field in ROLLUP_TOTALS]
+            for total in Rollup.search([]).read(["ancestor_id", *ROLLUP_TOTALS])
+        }
+        Rollup._rebuild()
+        self.assertEqual(
+            {
+                total["ancestor_id"][0]: [total[field] for field in ROLLUP_TOTALS]
+                for total in Rollup.search([]).read(["ancestor_id", *ROLLUP_TOTALS])
+            },
+            totals,
+        )
@@ -13,6 +13,8 @@
     "license": "AGPL-3",
     "depends": [
         "project",
+        "project_sequence_reserve",
+        "project_task_display_name_prefix",
     ],
     "data": [
         "data/task_sequence.xml",
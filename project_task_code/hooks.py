@@ -1,30 +1,50 @@
 # Copyright 2016 Tecnativa <vicent.cubells@tecnativa.com>
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+# Prefix, suffix and padding of the sequence defined in data/task_sequence.xml
+DEFAULT_CODE_FORMAT = ("T", "", 4)
+
+
+def _set_task_codes(cr, prefix, suffix, padding):
+    """
+    Number all the existing tasks by id in a single statement, formatting the
+    codes as the task sequence does.
+    """
+    cr.execute(
+        """
+        UPDATE project_task
+        SET code = %s || lpad(x.number, greatest(length(x.number), %s), '0') || %s
+        FROM (
+          SELECT id, (row_number() OVER (ORDER BY id))::text AS number
+          FROM project_task
+        ) AS x
+        WHERE project_task.id = x.id;
+        """,
+        (prefix, padding, suffix),
+    )
+
 
 def pre_init_hook(env):
     """
     With this pre-init-hook we want to avoid error when creating the UNIQUE
     code constraint when the module is installed and before the post-init-hook
-    is launched.
+    is launched. The codes are directly given in the format of the default task
+    sequence, so the post-init-hook doesn't need to rewrite them.
     """
     env.cr.execute("ALTER TABLE project_task ADD COLUMN code character varying;")
-    env.cr.execute("UPDATE project_task SET code = id;")
+    _set_task_codes(env.cr, *DEFAULT_CODE_FORMAT)
 
 
 def post_init_hook(env):
     """
     This post-init-hook will update all existing task assigning them the
-    corresponding sequence code.
+    corresponding sequence code, then advance the sequence once.
     """
-    task_obj = env["project.task"]
-    sequence_obj = env["ir.sequence"]
-    tasks = task_obj.search([], order="id")
-    for task_id in tasks.ids:
-        env.cr.execute(
-            "UPDATE project_task SET code = %s WHERE id = %s;",
-            (
-                sequence_obj.next_by_code("project.task"),
-                task_id,
-            ),
-        )
+    sequence = env.ref("project_task_code.sequence_task")
+    prefix, suffix = sequence._get_prefix_suffix()
+    code_format = (prefix, suffix, sequence.padding)
+    if code_format != DEFAULT_CODE_FORMAT:
+        _set_task_codes(env.cr, *code_format)
+        env["project.task"].invalidate_model(["code"])
+    env.cr.execute("SELECT count(*) FROM project_task;")
+    sequence.write({"number_next": env.cr.fetchone()[0] + 1})
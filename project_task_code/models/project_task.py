@@ -18,6 +18,7 @@ class ProjectTask(models.Model):
         default="/",
         readonly=True,
         copy=False,
+        index=True,
     )
 
     _sql_constraints = [
@@ -32,18 +33,35 @@ class ProjectTask(models.Model):
     def SELF_WRITABLE_FIELDS(self):
         return super().SELF_WRITABLE_FIELDS | PROJECT_TASK_WRITABLE_FIELDS
 
+    @api.model
+    def _get_next_codes(self, count):
+        """Reserve ``count`` task codes from the task sequence at once."""
+        sequence_model = self.env["ir.sequence"].sudo()
+        sequence = sequence_model.search(
+            [
+                ("code", "=", "project.task"),
+                ("company_id", "in", [self.env.company.id, False]),
+            ],
+            order="company_id",
+            limit=1,
+        )
+        if not sequence:
+            return ["/"] * count
+        return sequence._next_block(count)
+
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if vals.get("code", "/") == "/":
-                vals["code"] = (
-                    self.sudo().env["ir.sequence"].next_by_code("project.task") or "/"
-                )
+        pending_vals_list = [vals for vals in vals_list if vals.get("code", "/") == "/"]
+        if pending_vals_list:
+            codes = self._get_next_codes(len(pending_vals_list))
+            for vals, code in zip(pending_vals_list, codes, strict=True):
+                vals["code"] = code
         return super().create(vals_list)
 
-    @api.depends("name", "code")
-    def _compute_display_name(self):
-        result = super()._compute_display_name()
-        for task in self.filtered("code"):
-            task.display_name = f"[{task.code}] {task.display_name}"
-        return result
+    def _display_name_prefix_providers(self):
+        return super()._display_name_prefix_providers() + [
+            (["code"], "_get_code_display_name_prefixes")
+        ]
+
+    def _get_code_display_name_prefixes(self):
+        return {task.id: task.code for task in self}
@@ -3,6 +3,8 @@
 
 from odoo.addons.base.tests.common import BaseCommon
 
+from ..hooks import post_init_hook
+
 
 class TestProjectTaskCode(BaseCommon):
     @classmethod
@@ -24,6 +26,24 @@ class TestProjectTaskCode(BaseCommon):
         self.assertNotEqual(project_task.code, "/")
         self.assertEqual(project_task.code, code)
 
+    def test_new_task_code_assign_batch(self):
+        number_next = self.task_sequence.number_next_actual
+        project_tasks = self.project_task_model.create(
+            [
+                {"name": "Batch task 1"},
+                {"name": "Batch task 2", "code": "BATCH-2"},
+                {"name": "Batch task 3"},
+            ]
+        )
+        self.assertEqual(
+            project_tasks.mapped("code"),
+            [
+                self.task_sequence.get_next_char(number_next),
+                "BATCH-2",
+                self.task_sequence.get_next_char(number_next + 1),
+            ],
+        )
+
     def test_name_get(self):
         number_next = self.task_sequence.number_next_actual
         code = self.task_sequence.get_next_char(number_next)
@@ -64,3 +84,14 @@ class TestProjectTaskCode(BaseCommon):
             map(lambda x: x[0], result),
             f"Task with code {project_task.code} should not be in the results",
         )
+
+    def test_post_init_hook(self):
+        self.task_sequence.write({"prefix": "TK", "padding": 5})
+        post_init_hook(self.env)
+        tasks = self.project_task_model.with_context(active_test=False).search(
+            [], order="id"
+        )
+        self.assertEqual(tasks[0].code, "TK00001")
+        self.assertEqual(tasks[-1].code, f"TK{len(tasks):05d}")
+        project_task = self.project_task_model.create({"name": "After hook"})
+        self.assertEqual(project_task.code, f"TK{len(tasks) + 1:05d}")
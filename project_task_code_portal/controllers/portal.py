@@ -26,12 +26,33 @@ class PortalProjectTask(ProjectCustomerPortal):
                     break
         return domain
 
-    def get_accessible_task_by_code(self, task_code, access_token):
-        task_id = (
-            request.env["project.task"]
-            .sudo()
-            .search([("code", "=", task_code)], limit=1)
-            .id
+    @http.route("/my/tasks/seek", type="json", auth="user")
+    def portal_my_tasks_seek(
+        self, after_id=0, search=None, search_in="all", limit=80, **kw
+    ):
+        """Keyset paged task list for portal clients browsing many tasks."""
+        domain = [("project_id.privacy_visibility", "=", "portal")]
+        if search:
+            domain += self._task_get_search_domain(search_in, search, False, False)
+        tasks, next_after_id = request.env["project.task"]._search_portal_page(
+            domain, after_id=after_id, limit=min(int(limit), 200)
+        )
+        return {
+            "tasks": [
+                {
+                    "id": task.id,
+                    "code": task.code,
+                    "name": task.name,
+                    "url": task.portal_url_path,
+                }
+                for task in tasks
+            ],
+            "next_after_id": next_after_id,
+        }
+
+    def get_accessible_task_by_code(self, task_code, access_token, project_id=False):
+        task_id = request.env["project.task"]._get_task_id_by_code(
+            task_code, project_id=project_id
         )
         if not task_id:
             raise MissingError(_("No task with this code."))
@@ -59,8 +80,8 @@ class PortalProjectTask(ProjectCustomerPortal):
                 task_sudo, report_type, download=kw.get("download")
             )
 
-        # ensure attachment are accessible with access token inside template
-        task_sudo.attachment_ids.generate_access_token()
+        # Task attachments get their access token when they are linked to the
+        # task (see ir.attachment), so that page views don't write.
         if project_sharing is True:
             # Then the user arrives to the stat button shown in form view of
             # project.task and the portal user can see only 1 task
@@ -82,10 +103,11 @@ class PortalProjectTask(ProjectCustomerPortal):
             project_sudo = self._document_check_access(
                 "project.project", project_id, access_token
             )
-            task_sudo = self.get_accessible_task_by_code(task_code, access_token)
+            task_sudo = self.get_accessible_task_by_code(
+                task_code, access_token, project_id=project_id
+            )
         except (AccessError, MissingError):
             return request.redirect("/my")
-        task_sudo.attachment_ids.generate_access_token()
         values = self._task_get_page_view_values(
             task_sudo, access_token, project=project_sudo, **kw
         )
@@ -0,0 +1,45 @@
+# Copyright (C) 2025 Cetmix OÜ
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class IrAttachment(models.Model):
+    _inherit = "ir.attachment"
+
+    def init(self):
+        # Task attachments get their access token when they are linked to the
+        # task, fill the missing ones once here instead of on portal page views.
+        self.env.cr.execute(
+            """
+            SELECT id FROM ir_attachment
+            WHERE res_model = 'project.task' AND access_token IS NULL
+            """
+        )
+        attachment_ids = [row[0] for row in self.env.cr.fetchall()]
+        if attachment_ids:
+            self.env.cr.execute(
+                """
+                UPDATE ir_attachment a
+                SET access_token = v.access_token
+                FROM unnest(%s::int[], %s::varchar[]) AS v(id, access_token)
+                WHERE a.id = v.id
+                """,
+                (
+                    attachment_ids,
+                    [self._generate_access_token() for _id in attachment_ids],
+                ),
+            )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get("res_model") == "project.task" and not vals.get("access_token"):
+                vals["access_token"] = self._generate_access_token()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        res = super().write(vals)
+        if vals.get("res_model") == "project.task":
+            self.filtered(lambda a: not a.access_token).sudo().generate_access_token()
+        return res
@@ -1,20 +1,23 @@
 # Copyright (C) 2025 Cetmix OÜ
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+from odoo import api, fields, models
+from odoo.tools.sql import column_exists, create_column, create_index
 
 
 class ProjectTask(models.Model):
     _inherit = "project.task"
 
     portal_url = fields.Char(compute="_compute_portal_url")
-    portal_url_visible = fields.Boolean(compute="_compute_portal_url")
+    portal_url_path = fields.Char(compute="_compute_portal_url_path", store=True)
+    portal_url_visible = fields.Boolean(compute="_compute_portal_url_path", store=True)
 
     @property
     def SELF_READABLE_FIELDS(self):
         return super().SELF_READABLE_FIELDS | {
             "code",
             "portal_url",
+            "portal_url_path",
             "portal_url_visible",
         }
 
@@ -22,13 +25,82 @@ class ProjectTask(models.Model):
     def SELF_WRITABLE_FIELDS(self):
         return super().SELF_WRITABLE_FIELDS | {"code"}
 
+    def _auto_init(self):
+        # Pre-create and fill the stored portal URL columns for avoiding a
+        # costly computation on big task tables.
+        cr = self.env.cr
+        if not column_exists(cr, "project_task", "portal_url_path"):
+            create_column(cr, "project_task", "portal_url_path", "varchar")
+            create_column(cr, "project_task", "portal_url_visible", "boolean")
+            cr.execute(
+                """
+                UPDATE project_task t
+                SET portal_url_visible = TRUE,
+                    portal_url_path = '/my/projects/' || p.id || '/task/' || t.code
+                FROM project_project p
+                WHERE p.id = t.project_id AND p.privacy_visibility = 'portal'
+                """
+            )
+        res = super()._auto_init()
+        # The portal "ref" search is an ilike on the task code, which only a
+        # trigram index can serve (the task name one is created by project).
+        if self.pool.has_trigram:
+            create_index(
+                cr,
+                "project_task_code_trgm_index",
+                "project_task",
+                ["code gin_trgm_ops"],
+                method="gin",
+            )
+        return res
+
+    @api.model
+    def _get_task_id_by_code(self, code, project_id=False):
+        """Resolve a task code, within the given project if any, to a task id
+        with one search on the code index."""
+        domain = [("code", "=", code)]
+        if project_id:
+            domain.append(("project_id", "=", project_id))
+        return self.sudo().search(domain, limit=1).id
+
+    @api.depends("code", "project_id.privacy_visibility")
+    def _compute_portal_url_path(self):
+        for rec in self:
+            rec.portal_url_visible = rec.project_id.privacy_visibility == "portal"
+            rec.portal_url_path = (
+                f"/my/projects/{rec.project_id.id}/task/{rec.code}"
+                if rec.portal_url_visible
+                else False
+            )
+
+    @api.depends("portal_url_path")
     def _compute_portal_url(self):
+        # The base URL only depends on the company, resolve it once per company
+        base_urls = {}
         for rec in self:
-            rec.portal_url = ""
-            rec.portal_url_visible = False
-            if rec.project_id.privacy_visibility == "portal":
-                rec.portal_url_visible = True
-                base_url = rec.get_base_url()
-                rec.portal_url = (
-                    f"{base_url}/my/projects/{rec.project_id.id}/task/{rec.code}"
-                )
+            if not rec.portal_url_path:
+                rec.portal_url = ""
+                continue
+            if rec.company_id not in base_urls:
+                base_urls[rec.company_id] = rec.get_base_url()
+            rec.portal_url = base_urls[rec.company_id] + rec.portal_url_path
+
+    @api.model
+    def _search_portal_page(self, domain, after_id=0, limit=80):
+        """Return a page of tasks for portal lists, with keyset paging on the
+        task id: pass the returned ``next_after_id`` as ``after_id`` to get
+        the following page, at the cost of the first one whatever the depth.
+
+        :return: tuple of the tasks and the next ``after_id`` (False on the
+            last page)
+        """
+        limit = max(int(limit), 1)
+        if after_id:
+            domain = [*domain, ("id", ">", int(after_id))]
+        tasks = self.search_fetch(
+            domain, ["code", "name", "portal_url_path"], limit=limit + 1, order="id"
+        )
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            return tasks, tasks[-1].id
+        return tasks, False
@@ -311,6 +311,36 @@ class TestPortalProjectTaskCode(TestProjectPortalCommon, HttpCaseWithUserPortal)
         response = self.url_open(url)
         self.assertEqual(response.url, self.base_my_url)
 
+    def test_task_code_resolver(self):
+        task_model = self.env["project.task"]
+        code = self.task_1.code
+        project_id = self.task_1.project_id.id
+        other_project = self.env["project.project"].create({"name": "Other project"})
+        self.assertEqual(task_model._get_task_id_by_code(code), self.task_1.id)
+        self.assertEqual(
+            task_model._get_task_id_by_code(code, project_id=project_id),
+            self.task_1.id,
+        )
+        self.assertFalse(
+            task_model._get_task_id_by_code(code, project_id=other_project.id)
+        )
+
+        self.task_1.code = "NEW-CODE"
+        self.assertFalse(task_model._get_task_id_by_code(code))
+        self.assertEqual(task_model._get_task_id_by_code("NEW-CODE"), self.task_1.id)
+
+    def test_task_attachment_access_token(self):
+        attachment = self.env["ir.attachment"].create(
+            {"name": "task.txt", "res_model": "project.task", "res_id": self.task_1.id}
+        )
+        self.assertTrue(attachment.access_token)
+        attachment = self.env["ir.attachment"].create(
+            {"name": "other.txt", "res_model": "res.partner"}
+        )
+        self.assertFalse(attachment.access_token)
+        attachment.write({"res_model": "project.task", "res_id": self.task_1.id})
+        self.assertTrue(attachment.access_token)
+
     def test_portal_url(self):
         """Test that portal_url and portal_url_visible are correctly computed."""
         other_project = self.env["project.project"].create(
@@ -330,3 +360,43 @@ class TestPortalProjectTaskCode(TestProjectPortalCommon, HttpCaseWithUserPortal)
         url = f"{self.base_projects_url}/{other_project.id}/task/{task.code}"
         self.assertEqual(task.portal_url_visible, True)
         self.assertEqual(task.portal_url, url)
+
+    def test_portal_url_stored(self):
+        project = self.env["project.project"].create(
+            {"name": "Private project", "privacy_visibility": "followers"}
+        )
+        task = self.env["project.task"].create(
+            {"name": "Task", "project_id": project.id, "code": "STORED-CODE"}
+        )
+        self.assertFalse(task.portal_url_visible)
+        self.assertFalse(task.portal_url)
+
+        project.privacy_visibility = "portal"
+        self.assertTrue(task.portal_url_visible)
+        self.assertEqual(
+            task.portal_url_path, f"/my/projects/{project.id}/task/STORED-CODE"
+        )
+        task.code = "NEW-STORED-CODE"
+        self.assertTrue(task.portal_url.endswith("/task/NEW-STORED-CODE"))
+
+    def test_task_code_trigram_index(self):
+        if not self.registry.has_trigram:
+            self.skipTest("pg_trgm is not available")
+        self.assertTrue(
+            tools.sql.index_exists(self.env.cr, "project_task_code_trgm_index")
+        )
+
+    def test_search_portal_page(self):
+        task_model = self.env["project.task"]
+        domain = [("project_id", "=", self.project_pigs.id)]
+        all_tasks = task_model.search(domain, order="id")
+        tasks, next_after_id = task_model._search_portal_page(domain, limit=2)
+        self.assertEqual(tasks, all_tasks[:2])
+        self.assertEqual(next_after_id, all_tasks[1].id)
+        seen = tasks
+        while next_after_id:
+            tasks, next_after_id = task_model._search_portal_page(
+                domain, after_id=next_after_id, limit=2
+            )
+            seen |= tasks
+        self.assertEqual(seen, all_tasks)
@@ -0,0 +1,13 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+{
+    "name": "Project Task Display Name Prefix",
+    "summary": "Compose the task display name from prefixes given by other addons",
+    "version": "18.0.1.0.0",
+    "category": "Project",
+    "website": "https://github.com/OCA/project",
+    "author": "Odoo Community Association (OCA)",
+    "license": "LGPL-3",
+    "depends": ["project"],
+    "installable": True,
+}
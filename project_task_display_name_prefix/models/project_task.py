@@ -0,0 +1,39 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+
+from odoo import api, models
+
+
+class ProjectTask(models.Model):
+    _inherit = "project.task"
+
+    def _display_name_prefix_providers(self):
+        """Return the prefix providers of the task display name.
+
+        Each provider is a ``(field names, method name)`` tuple. The method is
+        called once per compute batch and returns a ``{task id: prefix}``
+        mapping, the field names are added to the display name dependencies.
+        Addons extend the list instead of overriding _compute_display_name.
+        """
+        return []
+
+    def _display_name_prefix_depends(self):
+        depends = ["name"]
+        for field_names, _method in self._display_name_prefix_providers():
+            depends += field_names
+        return depends
+
+    @api.depends(lambda self: self._display_name_prefix_depends())
+    def _compute_display_name(self):
+        super()._compute_display_name()
+        providers = self._display_name_prefix_providers()
+        if not providers:
+            return
+        # The last registered provider gives the leftmost prefix, as the
+        # display name overrides used to stack.
+        prefixes = [getattr(self, method)() for _fields, method in reversed(providers)]
+        for task in self:
+            task_prefixes = [
+                f"[{prefix[task.id]}]" for prefix in prefixes if prefix.get(task.id)
+            ]
+            if task_prefixes:
+                task.display_name = " ".join([*task_prefixes, task.display_name])
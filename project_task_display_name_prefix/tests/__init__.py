@@ -0,0 +1 @@
+from . import test_project_task_display_name_prefix
@@ -0,0 +1,35 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+
+class TestProjectTaskDisplayNamePrefix(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.task = cls.env["project.task"].create({"name": "Test task"})
+
+    def test_display_name_prefixes(self):
+        task_model = type(self.env["project.task"])
+        providers = self.task._display_name_prefix_providers() + [
+            (["name"], "_get_test_prefixes")
+        ]
+        with (
+            patch.object(
+                task_model,
+                "_display_name_prefix_providers",
+                lambda self: providers,
+                create=True,
+            ),
+            patch.object(
+                task_model,
+                "_get_test_prefixes",
+                lambda self: {task.id: "TEST" for task in self},
+                create=True,
+            ),
+        ):
+            self.task.invalidate_recordset(["display_name"])
+            self.assertTrue(self.task.display_name.startswith("[TEST] "))
+            self.assertTrue(self.task.display_name.endswith("Test task"))
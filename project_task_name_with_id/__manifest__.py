@@ -7,7 +7,7 @@
     "author": "Quartile Limited, Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/project",
     "license": "AGPL-3",
-    "depends": ["project"],
+    "depends": ["project", "project_task_display_name_prefix"],
     "data": ["views/project_task_views.xml"],
     "installable": True,
 }
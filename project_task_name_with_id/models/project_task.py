@@ -4,22 +4,36 @@
 from odoo import api, models
 from odoo.osv import expression
 
+POSITIVE_OPERATORS = ("ilike", "=ilike", "like", "=like", "=")
+# Highest value of the integer id column
+MAX_ID = 2**31 - 1
+
 
 class ProjectTask(models.Model):
     _inherit = "project.task"
 
-    @api.depends("name")
-    def _compute_display_name(self):
-        super()._compute_display_name()
-        for task in self:
-            task.display_name = f"[{task.id}] {task.display_name}"
-        return
+    def _display_name_prefix_providers(self):
+        return super()._display_name_prefix_providers() + [
+            ([], "_get_id_display_name_prefixes")
+        ]
+
+    def _get_id_display_name_prefixes(self):
+        return {task.id: task.id for task in self}
 
     @api.model
     def name_search(self, name="", args=None, operator="ilike", limit=100):
         args = args or []
-        domain = expression.AND(
-            [args, ["|", ("name", operator, name), ("id", operator, name)]]
-        )
-        records = self.search(domain, limit=limit)
+        name_domain = [("name", operator, name)]
+        # Only match the ID exactly, and only when it can be one, so that the
+        # primary key index is used instead of casting every ID to text.
+        task_id = name.strip()
+        if (
+            operator in POSITIVE_OPERATORS
+            and task_id.isascii()
+            and task_id.isdecimal()
+            and int(task_id) <= MAX_ID
+        ):
+            name_domain = expression.OR([name_domain, [("id", "=", int(task_id))]])
+        domain = expression.AND([args, name_domain])
+        records = self.search_fetch(domain, ["display_name"], limit=limit)
         return [(rec.id, rec.display_name or "") for rec in records]
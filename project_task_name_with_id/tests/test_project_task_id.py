@@ -28,6 +28,20 @@ class TestProjectTaskID(TransactionCase):
         self.assertEqual(len(tasks), 1)
         self.assertEqual(tasks[0][0], self.project_task.id)
 
+    def test_name_search_id_exact(self):
+        task_id = self.project_task.id
+        other_task = self.ProjectTask.create({"name": f"Other task {task_id}"})
+        tasks = self.ProjectTask.name_search(str(task_id))
+        self.assertEqual(
+            {task[0] for task in tasks}, {self.project_task.id, other_task.id}
+        )
+        # The ID is not matched partially
+        tasks = self.ProjectTask.name_search(str(task_id)[:-1] + "9" * 12)
+        self.assertFalse(tasks)
+        # Non ASCII digits are searched in the names only
+        self.assertFalse(self.ProjectTask.name_search("\u00b2"))
+        self.assertFalse(self.ProjectTask.name_search("\u0661"))
+
     def test_display_name(self):
         display_name = self.project_task.display_name
         task_id = self.project_task.id